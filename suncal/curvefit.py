@@ -8,11 +8,14 @@ of interest to pull, for example the slope value, into an UncertCalc instance.
 '''
 
 from collections import namedtuple
+import functools
 import inspect
 import numpy as np
 import sympy
 from scipy import odr
+import scipy.linalg
 import scipy.optimize
+import scipy.special
 import yaml
 
 from . import out_curvefit
@@ -24,7 +27,33 @@ from .uarray import Array  # Explicitly import Array so it can be accessed via c
 Fit = namedtuple('Fit', ['coeff', 'covariance'])
 
 FitResids = namedtuple('FitResiduals', ['residuals', 'Syx', 'r', 'F', 'SSres', 'SSreg'])
-FitOut = namedtuple('FitOutput', ['coeff', 'uncert', 'covariance', 'degf', 'residuals', 'samples', 'acceptance'], defaults=(None,)*7)
+FitOut = namedtuple('FitOutput', ['coeff', 'uncert', 'covariance', 'degf', 'residuals', 'samples', 'acceptance', 'yfit'], defaults=(None,)*8)
+ParsedMath = namedtuple('ParsedMath', ['function', 'sympyexpr', 'argnames'])
+
+
+@functools.lru_cache(maxsize=128)
+def _parse_fitexpr(expr):
+    ''' Parse and lambdify the curve fit expression string. Cached so that
+        sympy only parses and compiles each expression once.
+    '''
+    uparser.parse_math(expr)  # Will raise if not valid expression
+    symexpr = sympy.sympify(expr)
+    argnames = sorted(str(s) for s in symexpr.free_symbols)
+    if 'x' not in argnames:
+        raise ValueError('Expression must contain "x" variable.')
+    argnames.remove('x')
+    if len(argnames) == 0:
+        raise ValueError('Expression must contain one or more parameters to fit.')
+    func = sympy.lambdify(['x'] + argnames, symexpr, 'numpy')  # Make sure to specify 'numpy' so nans are returned instead of complex numbers
+    return ParsedMath(func, symexpr, tuple(argnames))
+
+
+@functools.lru_cache(maxsize=128)
+def _sympify_fitexpr(exprstr):
+    ''' Sympy expression for built-in fit function strings. Cached since
+        sympy expressions are immutable and can be shared between fits.
+    '''
+    return sympy.sympify(exprstr)
 
 
 class CurveFit(object):
@@ -71,6 +100,10 @@ class CurveFit(object):
         odr: bool
             Force use of orthogonal regression
 
+        seed: int, optional
+            Seed for the random number generator used by the MCMC method. If None,
+            the generator is seeded from the global numpy random state.
+
         absolute_sigma: boolean
             Treat uncertainties in an absolute sense. If false, only relative
             magnitudes matter.
@@ -103,66 +136,97 @@ class CurveFit(object):
         self.odr = odr
         self.bounds = bounds
         self.p0 = p0
+        self._expr = None  # Sympy expression is only parsed when needed, see expr property
+        self._nominalfit = None  # (key, coeffs) of unweighted fit to the nominal data, see fit_nominal
 
+        # Nonlinear functions below are evaluated in place on one copy of x,
+        # rather than allocating a new array for every operation in the expression.
+        # y[()] returns a scalar when x is scalar.
         if callable(func):
             self.fitname = 'callable'
 
         elif self.fitname == 'line':
-            self.expr = sympy.sympify('a + b*x')
+            self._exprstr = 'a + b*x'
             def func(x, b, a):
                 return a + b*x
 
         elif self.fitname == 'exp':  # Full exponential
-            self.expr = sympy.sympify('c + a * exp(x/b)')
+            self._exprstr = 'c + a * exp(x/b)'
             def func(x, a, b, c):
-                return c + a * np.exp(x/b)
+                y = np.array(x, dtype=float)
+                y /= b
+                np.exp(y, out=y)
+                y *= a
+                y += c
+                return y[()]
 
         elif self.fitname == 'decay':  # Exponential decay to zero (no c parameter)
-            self.expr = sympy.sympify('a * exp(-x/b)')
+            self._exprstr = 'a * exp(-x/b)'
             def func(x, a, b):
-                return a * np.exp(-x/b)
+                y = np.array(x, dtype=float)
+                y /= -b
+                np.exp(y, out=y)
+                y *= a
+                return y[()]
 
         elif self.fitname == 'decay2':  # Exponential decay, using rate lambda rather than time constant tau
-            self.expr = sympy.sympify('a * exp(-x*b)')
+            self._exprstr = 'a * exp(-x*b)'
             def func(x, a, b):
-                return a * np.exp(-x*b)
+                y = np.array(x, dtype=float)
+                y *= -b
+                np.exp(y, out=y)
+                y *= a
+                return y[()]
 
         elif self.fitname == 'log':
-            self.expr = sympy.sympify('a + b * log(x-c)')
+            self._exprstr = 'a + b * log(x-c)'
             def func(x, a, b, c):
-                return a + b * np.log(x-c)
+                y = np.array(x, dtype=float)
+                y -= c
+                np.log(y, out=y)
+                y *= b
+                y += a
+                return y[()]
 
         elif self.fitname == 'logistic':
-            self.expr = sympy.sympify('a / (1 + exp((x-c)/b)) + d')
+            self._exprstr = 'a / (1 + exp((x-c)/b)) + d'
             def func(x, a, b, c, d):
-                return d + a / (1 + np.exp((x-c)/b))
+                y = np.array(x, dtype=float)
+                y -= c
+                y /= b
+                np.exp(y, out=y)
+                y += 1
+                np.divide(a, y, out=y)
+                y += d
+                return y[()]
 
         elif self.fitname == 'quad' or (func == 'poly' and polyorder == 2):
-            self.expr = sympy.sympify('a + b*x + c*x**2')
+            self._exprstr = 'a + b*x + c*x**2'
             def func(x, a, b, c):
                 return a + b*x + c*x*x
 
         elif self.fitname == 'cubic' or (func == 'poly' and polyorder == 3):
-            self.expr = sympy.sympify('a + b*x + c*x**2 + d*x**3')
+            self._exprstr = 'a + b*x + c*x**2 + d*x**3'
             def func(x, a, b, c, d):
                 return a + b*x + c*x*x + d*x*x*x
 
         elif self.fitname == 'poly':
-            def func(x, *p):
-                return np.poly1d(p[::-1])(x)  # Coeffs go in reverse order (...e, d, c, b, a)
-
             polyorder = int(polyorder)
             if polyorder < 1 or polyorder > 12:
                 raise ValueError('Polynomial order out of range')
+
+            def func(x, *p):
+                return np.polyval(p[::-1], x)  # Coeffs go in reverse order (...e, d, c, b, a)
+
             varnames = [chr(ord('a')+i) for i in range(polyorder+1)]
-            self.expr = sympy.sympify('+'.join(v+'*x**{}'.format(i) for i, v in enumerate(varnames)))
+            self._exprstr = '+'.join(v+'*x**{}'.format(i) for i, v in enumerate(varnames))
 
             # variable *args must have initial guess for scipy
             if self.p0 is None:
                 self.p0 = np.ones(polyorder+1)
         else:
             # actual expression as string
-            func, self.expr, _ = self.parse_math(self.fitname)
+            func, self._expr, _ = self.parse_math(self.fitname)
 
         self.func = func
 
@@ -174,7 +238,7 @@ class CurveFit(object):
         self.numparams = len(self.pnames)
 
         if self.fitname == 'callable':
-            self.expr = sympy.sympify('f(x, ' + ', '.join(self.pnames) + ')')
+            self._exprstr = 'f(x, ' + ', '.join(self.pnames) + ')'
 
         if self.bounds is None:
             bounds = (-np.inf, np.inf)
@@ -184,11 +248,24 @@ class CurveFit(object):
 
         if self.fitname == 'line' and not odr:
             # use generic LINE fit for lines with no odr
-            self.fitfunc = lambda x, y, ux, uy, absolute_sigma=self.absolute_sigma: genlinefit(x, y, ux, uy, absolute_sigma=absolute_sigma)
+            self.fitfunc = functools.partial(genlinefit, absolute_sigma=self.absolute_sigma)
+        else:
+            self.fitfunc = functools.partial(genfit, self.func, p0=self.p0, method=method, bounds=bounds, odr=odr, absolute_sigma=self.absolute_sigma)
+
+        # Polynomials are linear in the fit parameters, so unweighted fits of many
+        # y-sample sets sharing the same x values can be solved all at once.
+        if self.fitname in ['line', 'quad', 'cubic', 'poly'] and not odr and self.bounds is None:
+            increasing = self.fitname != 'line'  # Line coefficients are (slope, intercept)
+            self.batch_fitfunc = functools.partial(polyfit_batch, order=self.numparams-1, increasing=increasing)
         else:
-            self.fitfunc = lambda x, y, ux, uy, absolute_sigma=self.absolute_sigma: genfit(self.func, x, y, ux, uy, p0=self.p0, method=method, bounds=bounds, odr=odr, absolute_sigma=absolute_sigma)
+            self.batch_fitfunc = None
 
-        return self.expr
+    @property
+    def expr(self):
+        ''' Sympy expression of the fit function '''
+        if self._expr is None:
+            self._expr = _sympify_fitexpr(self._exprstr)
+        return self._expr
 
     @classmethod
     def parse_math(cls, expr):
@@ -204,17 +281,8 @@ class CurveFit(object):
             argnames: list of strings
                 Names of arguments (except x) to function
         '''
-        uparser.parse_math(expr)  # Will raise if not valid expression
-        symexpr = sympy.sympify(expr)
-        argnames = sorted(str(s) for s in symexpr.free_symbols)
-        if 'x' not in argnames:
-            raise ValueError('Expression must contain "x" variable.')
-        argnames.remove('x')
-        if len(argnames) == 0:
-            raise ValueError('Expression must contain one or more parameters to fit.')
-        func = sympy.lambdify(['x'] + argnames, symexpr, 'numpy')  # Make sure to specify 'numpy' so nans are returned instead of complex numbers
-        ParsedMath = namedtuple('ParsedMath', ['function', 'sympyexpr', 'argnames'])
-        return ParsedMath(func, symexpr, argnames)
+        parsed = _parse_fitexpr(expr)
+        return parsed._replace(argnames=list(parsed.argnames))
 
     def clear(self):
         ''' Clear the sampled points '''
@@ -265,36 +333,59 @@ class CurveFit(object):
             CurveFitOutput object
         '''
         uy = np.zeros(len(self.arr.x)) if not self.arr.has_uy() else self.arr.uy
-        coeff, cov = self.fitfunc(self.arr.x, self.arr.y, self.arr.ux, uy)
+        design = self.design_matrix(self.arr.x)
+        coeff, cov = self.fitfunc(self.arr.x, self.arr.y, self.arr.ux, uy, design=design)
 
-        resids = (self.arr.y - self.func(self.arr.x, *coeff))  # All residuals (NOT squared)
-        sigmas = np.sqrt(np.diag(cov))
+        yfit = self.func(self.arr.x, *coeff) if design is None else design @ coeff
+        resids = (self.arr.y - yfit)  # All residuals (NOT squared)
+        sigmas = np.sqrt(cov.diagonal())
         degf = len(self.arr.x) - len(coeff)
         if self.absolute_sigma or not self.arr.has_uy():
             w = np.full(len(self.arr.x), 1)  # Unweighted residuals in Syx
         else:
             w = (1/uy**2)  # Determine weighted Syx
-            w = w/sum(w) * len(self.arr.y)      # Normalize weights so sum(wi) = N
-        SSres = sum(w*resids**2)   # Sum-of-squares of residuals
+            w = w/w.sum() * len(self.arr.y)      # Normalize weights so sum(wi) = N
+        SSres = np.dot(w, resids*resids)   # Sum-of-squares of residuals
         Syx = np.sqrt(SSres/degf)  # Standard error of the estimate (based on residuals)
-        SSreg = sum(w*(self.func(self.arr.x, *coeff) - sum(w*self.arr.y)/sum(w))**2)
+        SSreg = np.dot(w, (yfit - np.dot(w, self.arr.y)/w.sum())**2)
         r = np.sqrt(1-SSres/(SSres+SSreg))
         resids = FitResids(resids, Syx, r, SSreg*degf/SSres, SSres, SSreg)
-        out = FitOut(coeff, sigmas, cov, degf, resids)
+        out = FitOut(coeff, sigmas, cov, degf, resids, yfit=yfit)
         self.outputs['lsq'] = out
         return out
 
+    def design_matrix(self, x):
+        ''' Design matrix of the fit function at x, such that func(x, *p) == design @ p.
+            None if the fit function is not linear in its parameters.
+        '''
+        if self.fitname == 'line':
+            return np.vander(x, 2)  # Coefficients are (slope, intercept)
+        elif self.fitname in ['quad', 'cubic', 'poly']:
+            return np.vander(x, self.numparams, increasing=True)
+        return None
+
     def sample(self, samples=1000):
         ''' Generate Monte Carlo samples '''
         self.arr.clear()
         self.arr.sample(samples)
 
+    def fit_nominal(self):
+        ''' Unweighted fit to the nominal x, y data. Used for estimating u(y) and as
+            the starting point for Monte Carlo fits, so it is computed once per data set.
+        '''
+        key = (self.arr.x.tobytes(), self.arr.y.tobytes())
+        if self._nominalfit is None or self._nominalfit[0] != key:
+            pcoeff, _ = self.fitfunc(self.arr.x, self.arr.y, ux=None, uy=None, covariance=False,
+                                     design=self.design_matrix(self.arr.x))
+            self._nominalfit = (key, pcoeff)
+        return self._nominalfit[1]
+
     def estimate_uy(self):
         ''' Calculate an estimate for uy using residuals of fit for when uy is not given.
             This is what linefit() method does behind the scenes, this function allows the
             same behavior for GUM and Monte Carlo.
         '''
-        pcoeff, _ = self.fitfunc(self.arr.x, self.arr.y, ux=None, uy=None)
+        pcoeff = self.fit_nominal()
         uy = np.sqrt(np.sum((self.func(self.arr.x, *pcoeff) - self.arr.y)**2)/(len(self.arr.x) - len(pcoeff)))
         uy = np.full(len(self.arr.x), uy)
         return uy
@@ -316,28 +407,41 @@ class CurveFit(object):
         if self.arr.xsamples is None or self.arr.ysamples is None or self.arr.xsamples.shape[1] != samples:
             self.sample(samples)
 
-        self.samplecoeffs = np.zeros((samples, self.numparams))
-        for i in range(samples):
-            self.samplecoeffs[i], _ = self.fitfunc(self.arr.xsamples[:, i], self.arr.ysamples[:, i], ux=None, uy=None)
+        if self.batch_fitfunc is not None:
+            # Linear least squares, solve all samples together
+            xsamples = self.arr.xsamples if self.arr.has_ux() else self.arr.x
+            self.samplecoeffs = self.batch_fitfunc(xsamples, self.arr.ysamples)
+        else:
+            # Start each sample from the fit to the nominal data, which is already close to the solution
+            p0 = self.fit_nominal()
+            hasux = self.arr.has_ux()
+            # Without u(x), every sample shares the nominal x array and its design matrix
+            design = None if hasux else self.design_matrix(self.arr.x)
+            self.samplecoeffs = np.zeros((samples, self.numparams))
+            for i in range(samples):
+                xsample = self.arr.xsamples[:, i] if hasux else self.arr.x
+                self.samplecoeffs[i], _ = self.fitfunc(xsample, self.arr.ysamples[:, i], ux=None, uy=None, p0=p0,
+                                                       covariance=False, design=design)
 
         coeff = self.samplecoeffs.mean(axis=0)
         sigma = self.samplecoeffs.std(axis=0, ddof=1)
 
-        resids = (self.arr.y - self.func(self.arr.x, *coeff))
+        yfit = self.func(self.arr.x, *coeff)
+        resids = (self.arr.y - yfit)
         degf = len(self.arr.x) - len(coeff)
         if self.absolute_sigma or not self.arr.has_uy():
             w = np.full(len(self.arr.x), 1)  # Unweighted residuals in Syx
         else:
             w = (1/uy**2)  # Determine weighted Syx
-            w = w/sum(w) * len(self.arr.y)   # Normalize weights so sum(wi) = N
+            w = w/w.sum() * len(self.arr.y)   # Normalize weights so sum(wi) = N
         cov = np.cov(self.samplecoeffs.T)
-        SSres = sum(w*resids**2)   # Sum-of-squares of residuals
+        SSres = np.dot(w, resids*resids)   # Sum-of-squares of residuals
         Syx = np.sqrt(SSres/degf)  # Standard error of the estimate (based on residuals)
-        SSreg = sum(w*(self.func(self.arr.x, *coeff) - sum(w*self.arr.y)/sum(w))**2)
+        SSreg = np.dot(w, (yfit - np.dot(w, self.arr.y)/w.sum())**2)
         r = np.sqrt(1-SSres/(SSres+SSreg))
 
         resids = FitResids(resids, Syx, r, SSreg*degf/SSres, SSres, SSreg)
-        out = FitOut(coeff, sigma, cov, degf, resids, self.samplecoeffs)
+        out = FitOut(coeff, sigma, cov, degf, resids, self.samplecoeffs, yfit=yfit)
 
         self.outputs['mc'] = out
         return out
@@ -361,9 +465,6 @@ class CurveFit(object):
             -----
             Currently only supported with constant u(y) and u(x) = 0.
         '''
-        if self.seed is not None:
-            np.random.seed(self.seed)
-
         self.run_uyestimate()
         uy = self.arr.uy if self.arr.uy_estimate is None else self.arr.uy_estimate
 
@@ -373,23 +474,24 @@ class CurveFit(object):
             print('WARNING - MCMC algorithm with non-constant u(y). Using mean.')
 
         # Find initial guess/sigmas
-        p, cov = self.fitfunc(self.arr.x, self.arr.y, self.arr.ux, uy)
+        design = self.design_matrix(self.arr.x)
+        p, cov = self.fitfunc(self.arr.x, self.arr.y, self.arr.ux, uy, design=design)
         up = np.sqrt(np.diag(cov))
         if not all(np.isfinite(up)):
             raise ValueError('MCMC Could not determine initial sigmas. Try providing p0.')
 
-        if all(uy == 0):
+        if not np.any(uy):
             # Sigma2 is unknown. Estimate from residuals and vary through trace.
-            resids = (self.arr.y - self.func(self.arr.x, *p))
+            yfit = self.func(self.arr.x, *p)
+            resids = (self.arr.y - yfit)
             sig2 = resids.var(ddof=1)
-            sresid = np.std(np.array([self.arr.y, self.func(self.arr.x, *p)]), axis=0)
+            sresid = np.std(np.array([self.arr.y, yfit]), axis=0)
             sig2sig = 2*np.sqrt(sig2)
             sig2lim = np.percentile(sresid, 5)**2, np.percentile(sresid, 95)**2
-            varysigma = True
         else:
             # Sigma2 (variance of data) is known. Use it and don't vary sigma during trace.
             sig2 = uy.mean()**2
-            varysigma = False
+            sig2sig, sig2lim = None, None
 
         if not hasattr(self, 'priors') or self.priors is None:
             priors = [lambda x: 1 for i in range(len(self.pnames))]
@@ -401,59 +503,31 @@ class CurveFit(object):
                 # Will get div/0 below
                 raise ValueError('Initial prior for parameter {} is < 0'.format(self.pnames[pidx]))
 
-        accepts = np.zeros(len(p))
-        self.mcmccoeffs = np.zeros((samples, self.numparams))
-        self.sig2trace = np.zeros(samples)
-        for i in range(samples):
-            for pidx in range(len(p)):
-                pnew = p.copy()
-                pnew[pidx] = pnew[pidx] + np.random.normal(scale=up[pidx])
-
-                Y = self.func(self.arr.x, *p)  # Value using p (without sigma that was appended to p)
-                Ynew = self.func(self.arr.x, *pnew)  # Value using pnew
-
-                # NOTE: could use logpdf, but it seems slower than manually writing it out:
-                # problog = stat.norm.logpdf(self.arr.y, loc=I, scale=np.sqrt(sig2).sum()
-                problog = -1/(2*sig2) * sum((self.arr.y - Y)**2)
-                problognew = -1/(2*sig2) * sum((self.arr.y - Ynew)**2)
-
-                r = np.exp(problognew-problog) * priors[pidx](pnew[pidx]) / priors[pidx](p[pidx])
-                if r >= np.random.uniform():
-                    p = pnew
-                    accepts[pidx] += 1
-
-            if varysigma:
-                sig2new = sig2 + np.random.normal(scale=sig2sig)
-                if (sig2new < sig2lim[1] and sig2new > sig2lim[0]):
-                    Y = self.func(self.arr.x, *p)
-                    ss2 = sum((self.arr.y - Y)**2)
-                    problog = -1/(2*sig2) * ss2
-                    problognew = -1/(2*sig2new) * ss2
-                    if np.exp(problognew - problog) >= np.random.uniform():
-                        sig2 = sig2new
-
-            self.mcmccoeffs[i, :] = p
-            self.sig2trace[i] = sig2
+        # Without a seed, draw one from the global state so np.random.seed still makes MCMC repeatable
+        rng = np.random.default_rng(self.seed if self.seed is not None else np.random.randint(2**32 - 1))
+        self.mcmccoeffs, self.sig2trace, accepts = _mcmc_chain(self.func, self.arr.x, self.arr.y, p, up, sig2, priors, samples,
+                                                               sig2sig=sig2sig, sig2lim=sig2lim, design=design, rng=rng)
         burnin = int(burnin * samples)
         self.mcmccoeffs = self.mcmccoeffs[burnin:, :]
         self.sig2trace = self.sig2trace[burnin:]
 
         coeff = self.mcmccoeffs.mean(axis=0)
         sigma = self.mcmccoeffs.std(axis=0, ddof=1)
-        resids = (self.arr.y - self.func(self.arr.x, *coeff))
+        yfit = self.func(self.arr.x, *coeff) if design is None else design @ coeff
+        resids = (self.arr.y - yfit)
         degf = len(self.arr.x) - len(coeff)
         if self.absolute_sigma or not self.arr.has_uy():
             w = np.full(len(self.arr.x), 1)  # Unweighted residuals in Syx
         else:
             w = (1/uy**2)  # Determine weighted Syx
-            w = w/sum(w) * len(self.arr.y)   # Normalize weights so sum(wi) = N
+            w = w/w.sum() * len(self.arr.y)   # Normalize weights so sum(wi) = N
         cov = np.cov(self.mcmccoeffs.T)
-        SSres = sum(w*resids**2)   # Sum-of-squares of residuals
+        SSres = np.dot(w, resids*resids)   # Sum-of-squares of residuals
         Syx = np.sqrt(SSres/degf)  # Standard error of the estimate (based on residuals)
-        SSreg = sum(w*(self.func(self.arr.x, *coeff) - sum(w*self.arr.y)/sum(w))**2)
+        SSreg = np.dot(w, (yfit - np.dot(w, self.arr.y)/w.sum())**2)
         r = np.sqrt(1-SSres/(SSres+SSreg))
         resids = FitResids(resids, Syx, r, SSreg*degf/SSres, SSres, SSreg)
-        out = FitOut(coeff, sigma, cov, degf, resids, self.mcmccoeffs, accepts/samples)
+        out = FitOut(coeff, sigma, cov, degf, resids, self.mcmccoeffs, accepts/samples, yfit)
         self.outputs['mcmc'] = out
         return out
 
@@ -486,21 +560,22 @@ class CurveFit(object):
         uy = self.arr.uy if self.arr.uy_estimate is None else self.arr.uy_estimate
 
         coeff, cov, grad = uarray._GUM(lambda x, y: self.fitfunc(x, y, ux=None, uy=None)[0], self.arr.x, self.arr.y, self.arr.ux, uy)
-        sigmas = np.sqrt(np.diag(cov))
-        resids = (self.arr.y - self.func(self.arr.x, *coeff))
+        sigmas = np.sqrt(cov.diagonal())
+        yfit = self.func(self.arr.x, *coeff)
+        resids = (self.arr.y - yfit)
         degf = len(self.arr.x) - len(coeff)
         if self.absolute_sigma or not self.arr.has_uy():
-            w = 1  # Unweighted residuals in Syx
+            w = np.ones(len(self.arr.x))  # Unweighted residuals in Syx
         else:
             w = (1/uy**2)  # Determine weighted Syx
-            w = w/sum(w) * len(self.arr.y)   # Normalize weights so sum(wi) = N
-        SSres = sum(w*resids**2)
+            w = w/w.sum() * len(self.arr.y)   # Normalize weights so sum(wi) = N
+        SSres = np.dot(w, resids*resids)
         Syx = np.sqrt(SSres/degf)  # Standard error of the estimate (based on residuals)
-        SSreg = sum(w*(self.func(self.arr.x, *coeff) - self.arr.y.mean())**2)
+        SSreg = np.dot(w, (yfit - self.arr.y.mean())**2)
         r = np.sqrt(1-SSres/(SSres+SSreg))
 
         resids = FitResids(resids, Syx, r, SSreg*degf/SSres, SSres, SSreg)
-        out = FitOut(coeff, sigmas, cov, degf, resids)
+        out = FitOut(coeff, sigmas, cov, degf, resids, yfit=yfit)
 
         self.outputs['gum'] = out
         return out
@@ -514,25 +589,28 @@ class CurveFit(object):
         d['curve'] = self.fitname
         d['name'] = self.name
         d['desc'] = self.desc
-        d['odr'] = self.odr
+        # Scalars may be numpy types (e.g. np.int64 polyorder). Convert them to plain
+        # python types so the config can be written with the safe dumper.
+        d['odr'] = None if self.odr is None else bool(self.odr)
         d['xname'] = self.xname
         d['yname'] = self.yname
-        d['xdates'] = self.arr.xdate
-        d['abssigma'] = self.absolute_sigma
+        d['xdates'] = bool(self.arr.xdate)
+        d['abssigma'] = bool(self.absolute_sigma)
         if self.fitname == 'poly':
-            d['order'] = self.polyorder
+            d['order'] = int(self.polyorder)
         if self.p0 is not None:
-            d['p0'] = self.p0
+            d['p0'] = np.asarray(self.p0, dtype=float).tolist()
         if self.bounds is not None:
-            d['bound0'] = self.bounds[0]
-            d['bound1'] = self.bounds[1]
+            d['bound0'] = np.asarray(self.bounds[0], dtype=float).tolist()
+            d['bound1'] = np.asarray(self.bounds[1], dtype=float).tolist()
 
-        d['arrx'] = self.arr.x.astype('float').tolist()  # Can't yaml numpy arrays, use list
+        # Can't yaml numpy arrays. tolist() converts to plain floats in one C call.
+        d['arrx'] = self.arr.x.astype('float').tolist()
         d['arry'] = self.arr.y.astype('float').tolist()
         if self.arr.has_ux():
-            d['arrux'] = list(self.arr.ux)
+            d['arrux'] = self.arr.ux.astype('float').tolist()
         if self.arr.has_uy():
-            d['arruy'] = list(self.arr.uy)
+            d['arruy'] = self.arr.uy.astype('float').tolist()
         return d
 
     def save_config(self, fname):
@@ -544,7 +622,9 @@ class CurveFit(object):
                 File name or file object to save to
         '''
         d = self.get_config()
-        out = yaml.dump([d], default_flow_style=False)
+        # get_config converts to plain python types, so libyaml's C emitter can be used when available
+        dumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+        out = yaml.dump([d], Dumper=dumper, default_flow_style=False)
         try:
             fname.write(out)
         except AttributeError:
@@ -601,7 +681,120 @@ class CurveFit(object):
 
 # Functions for fitting curves
 #------------------------------------------------------------
-def odrfit(func, x, y, ux, uy, p0=None, absolute_sigma=True):
+def _mcmc_chain(func, x, y, p, up, sig2, priors, samples, sig2sig=None, sig2lim=None, design=None, rng=None,
+                refresh=2000):
+    ''' Run the Metropolis-in-Gibbs chain used by CurveFit.calc_MCMC.
+
+        Parameters
+        ----------
+        func: callable
+            The function to fit
+        x, y: arrays
+            X and Y data to fit
+        p: array
+            Starting parameter values
+        up: array
+            Standard deviation of proposal for each parameter
+        sig2: float
+            Variance of y data (starting value if sig2sig is given)
+        priors: list of callables
+            Prior probability function for each parameter
+        samples: int
+            Total number of samples to generate
+        sig2sig: float, optional
+            Standard deviation of proposal for sig2. If None, sig2 is not varied.
+        sig2lim: tuple, optional
+            Lower and upper limit of sig2
+        design: array, optional
+            Design matrix for functions linear in the parameters, so that
+            func(x, *p) == design @ p. Residuals are then updated incrementally
+            as each parameter changes instead of re-evaluating func.
+        rng: numpy.random.Generator, optional
+            Random number generator for proposals and acceptance draws. Seeded
+            from the global numpy random state if not provided.
+        refresh: int
+            With a design matrix, recompute the residuals directly every refresh
+            samples so rounding errors from the incremental updates don't accumulate.
+
+        Returns
+        -------
+        coeffs: array
+            Parameter trace, shape (samples, len(p))
+        sig2trace: array
+            Trace of sig2
+        accepts: array
+            Number of accepted proposals for each parameter
+    '''
+    numparams = len(p)
+    accepts = np.zeros(numparams)
+    coeffs = np.zeros((samples, numparams))
+    sig2trace = np.zeros(samples)
+
+    # Residual sum-of-squares for the current p is only recomputed when p changes
+    resid = y - func(x, *p)
+    ss = np.dot(resid, resid)
+    if design is not None:
+        colnorms = (design*design).sum(axis=0)
+    priorcur = np.array([prior(pval) for prior, pval in zip(priors, p)], dtype=float)
+
+    # Draw all random numbers up front rather than one scalar at a time
+    rng = np.random.default_rng(np.random.randint(2**32 - 1)) if rng is None else rng
+    proposals = rng.standard_normal((samples, numparams)) * up
+    uniforms = rng.random((samples, numparams))
+    if sig2sig is not None:
+        sig2proposals = rng.standard_normal(samples) * sig2sig
+        sig2uniforms = rng.random(samples)
+
+    for i in range(samples):
+        for pidx in range(numparams):
+            pnew = p.copy()
+            dp = proposals[i, pidx]
+            pnew[pidx] = pnew[pidx] + dp
+            priornew = priors[pidx](pnew[pidx])
+            if priornew <= 0:
+                continue  # Outside prior support. Reject without evaluating the fit.
+
+            if design is not None:
+                # Only one parameter changed, so residuals shift by dp times its column
+                ssnew = ss - 2*dp*np.dot(design[:, pidx], resid) + dp*dp*colnorms[pidx]
+            else:
+                residnew = y - func(x, *pnew)
+                ssnew = np.dot(residnew, residnew)
+
+            # NOTE: could use logpdf, but it seems slower than manually writing it out:
+            # problog = stat.norm.logpdf(y, loc=I, scale=np.sqrt(sig2).sum()
+            problog = -1/(2*sig2) * ss
+            problognew = -1/(2*sig2) * ssnew
+
+            r = np.exp(problognew-problog) * priornew / priorcur[pidx]
+            if r >= uniforms[i, pidx]:
+                p = pnew
+                ss = ssnew
+                priorcur[pidx] = priornew
+                if design is not None:
+                    resid = resid - dp*design[:, pidx]
+                else:
+                    resid = residnew
+                accepts[pidx] += 1
+
+        if design is not None and (i+1) % refresh == 0:
+            resid = y - design @ p
+            ss = np.dot(resid, resid)
+
+        if sig2sig is not None:
+            sig2new = sig2 + sig2proposals[i]
+            if (sig2new < sig2lim[1] and sig2new > sig2lim[0]):
+                problog = -1/(2*sig2) * ss
+                problognew = -1/(2*sig2new) * ss
+                if np.exp(problognew - problog) >= sig2uniforms[i]:
+                    sig2 = sig2new
+
+        coeffs[i, :] = p
+        sig2trace[i] = sig2
+    return coeffs, sig2trace, accepts
+
+
+def odrfit(func, x, y, ux, uy, p0=None, absolute_sigma=True, covariance=True):
     ''' Fit the curve using scipy's orthogonal distance regression (ODR)
 
         Parameters
@@ -618,6 +811,9 @@ def odrfit(func, x, y, ux, uy, p0=None, absolute_sigma=True):
         absolute_sigma: boolean
             Treat uncertainties in an absolute sense. If false, only relative
             magnitudes matter.
+        covariance: boolean
+            Calculate the covariance. If False, ODR skips its covariance
+            estimate and pcov is None.
 
         Returns
         -------
@@ -631,19 +827,23 @@ def odrfit(func, x, y, ux, uy, p0=None, absolute_sigma=True):
     def odrfunc(B, x):
         return func(x, *B)
 
-    if ux is not None and all(ux == 0):
+    if ux is not None and not np.any(ux):
         ux = None
-    if uy is not None and all(uy == 0):
+    if uy is not None and not np.any(uy):
         uy = None
 
     model = odr.Model(odrfunc)
     mdata = odr.RealData(x, y, sx=ux, sy=uy)
     modr = odr.ODR(mdata, model, beta0=p0)
+    if not covariance:
+        modr.set_job(var_calc=2)
     mout = modr.run()
     if mout.info != 1:
         print('Warning - ODR failed to converge')
 
-    if absolute_sigma:
+    if not covariance:
+        cov = None
+    elif absolute_sigma:
         # SEE: https://github.com/scipy/scipy/issues/6842.
         # If this issue is fixed, these options may be swapped!
         cov = mout.cov_beta
@@ -653,7 +853,8 @@ def odrfit(func, x, y, ux, uy, p0=None, absolute_sigma=True):
     return ODR(mout.beta, cov)
 
 
-def genfit(func, x, y, ux, uy, p0=None, method=None, bounds=(-np.inf, np.inf), odr=None, absolute_sigma=True):
+def genfit(func, x, y, ux, uy, p0=None, method=None, bounds=(-np.inf, np.inf), odr=None, absolute_sigma=True, covariance=True,
+           design=None):
     ''' Generic curve fit. Selects scipy.optimize.curve_fit if ux==0 or scipy.odr otherwise.
 
         Parameters
@@ -669,6 +870,11 @@ def genfit(func, x, y, ux, uy, p0=None, method=None, bounds=(-np.inf, np.inf), o
         absolute_sigma: boolean
             Treat uncertainties in an absolute sense. If false, only relative
             magnitudes matter.
+        covariance: boolean
+            Calculate the covariance. Only skipped by ODR fits, where pcov is then None.
+        design: array, optional
+            Design matrix of func at x for functions linear in the parameters, such that
+            func(x, *p) == design @ p. Used in place of func by curve_fit when p0 is given.
 
         Returns
         -------
@@ -678,16 +884,23 @@ def genfit(func, x, y, ux, uy, p0=None, method=None, bounds=(-np.inf, np.inf), o
             Covariance of coefficients. Standard error of coefficients is
             np.sqrt(np.diag(pcov)).
     '''
-    if odr or not (ux is None or all(ux == 0)):
-        return odrfit(func, x, y, ux, uy, p0=p0, absolute_sigma=absolute_sigma)
+    if odr or (ux is not None and np.any(ux)):
+        return odrfit(func, x, y, ux, uy, p0=p0, absolute_sigma=absolute_sigma, covariance=covariance)
     else:
-        if uy is None or all(uy == 0):
+        if design is not None and p0 is not None:
+            func, x = _linearmodel, design
+        if uy is None or not np.any(uy):
             return Fit(*scipy.optimize.curve_fit(func, x, y, p0=p0, bounds=bounds))
         else:
             return Fit(*scipy.optimize.curve_fit(func, x, y, sigma=uy, absolute_sigma=absolute_sigma, p0=p0, bounds=bounds))
 
 
-def genlinefit(x, y, ux, uy, absolute_sigma=True):
+def _linearmodel(design, *p):
+    ''' Model linear in the parameters, evaluated from its design matrix '''
+    return design @ np.asarray(p)
+
+
+def genlinefit(x, y, ux, uy, absolute_sigma=True, p0=None, covariance=True, design=None):
     ''' Generic straight line fit. Uses linefit() if ux==0 or linefitYork otherwise.
 
         Parameters
@@ -701,6 +914,13 @@ def genlinefit(x, y, ux, uy, absolute_sigma=True):
         absolute_sigma: boolean
             Treat uncertainties in an absolute sense. If false, only relative
             magnitudes matter.
+        p0: array-like
+            Ignored. Line fits are solved directly and need no initial guess.
+            Accepted so the signature matches genfit().
+        covariance: boolean
+            Ignored. The closed-form covariance is always calculated.
+        design: array
+            Ignored. Accepted so the signature matches genfit().
 
         Returns
         -------
@@ -710,12 +930,60 @@ def genlinefit(x, y, ux, uy, absolute_sigma=True):
             Covariance of coefficients. Standard error of coefficients is
             np.sqrt(np.diag(pcov)).
     '''
-    if ux is None or all(ux == 0):
+    if ux is None or not np.any(ux):
         return linefit(x, y, sig=uy, absolute_sigma=absolute_sigma)
     else:
         return linefitYork(x, y, sigx=ux, sigy=uy, absolute_sigma=absolute_sigma)
 
 
+def polyfit_batch(x, ysamples, order, increasing=True):
+    ''' Unweighted least-squares polynomial fit to many sets of y values,
+        solved together rather than one fit per set.
+
+        Parameters
+        ----------
+        x: array
+            X values of fit. Either 1D with length N, shared by all sets of y values,
+            or 2D with shape (N, samples) giving the x values of each set.
+        ysamples: array
+            2D array of Y values, shape (N, samples). Each column is fit separately.
+        order: int
+            Order of polynomial
+        increasing: bool
+            Order the coefficients with increasing powers of x (a + b*x + ...).
+            If False, coefficients are in decreasing order, as in [slope, intercept].
+
+        Returns
+        -------
+        coeff: array
+            2D array of fit coefficients, shape (samples, order+1)
+    '''
+    x = np.asarray(x)
+    if x.ndim == 1:
+        V = np.vander(x, order+1, increasing=increasing)
+        # QR-based gelsy is faster than the default SVD-based driver. Inputs come from
+        # sampled data, so skip the finite check. V is local and can be overwritten.
+        coeff, _, _, _ = scipy.linalg.lstsq(V, ysamples, lapack_driver='gelsy', check_finite=False, overwrite_a=True)
+        return coeff.T
+
+    # Each set has its own design matrix. Stack them and solve all at once with pinv.
+    # Center and scale x first so the Vandermonde matrices stay well conditioned
+    # (e.g. for dates as x values), then transform coefficients back to powers of x.
+    center = x.mean()
+    scale = x.std()
+    scale = scale if scale > 0 else 1
+    V = ((x.T[:, :, np.newaxis] - center) / scale) ** np.arange(order+1)   # Shape (samples, N, order+1)
+    coeff = (np.linalg.pinv(V) @ ysamples.T[:, :, np.newaxis])[:, :, 0]
+
+    # ((x-c)/s)**k = sum_j comb(k, j) * x**j * (-c)**(k-j) / s**k
+    T = np.zeros((order+1, order+1))
+    for k in range(order+1):
+        for j in range(k+1):
+            T[j, k] = scipy.special.comb(k, j) * (-center)**(k-j) / scale**k
+    coeff = coeff @ T.T
+    return coeff if increasing else coeff[:, ::-1]
+
+
 def linefit(x, y, sig, absolute_sigma=True):
     ''' Fit a line with uncertainty in y (but not x)
 
@@ -750,43 +1018,154 @@ def linefit(x, y, sig, absolute_sigma=True):
             W. H. Press, S. A. Teukolsky, W. T. Vetterling, B. P. Flannery.
             Cambridge University Press. 2002.
     '''
-    sig = np.atleast_1d(sig)
+    sig = np.atleast_1d(0 if sig is None else sig)
     if len(sig) == 1:
         sig = np.full(len(x), sig[0])
-    if all(sig) > 0:
-        wt = 1./sig**2
-        ss = sum(wt)
-        sx = sum(x*wt)
-        sy = sum(y*wt)
-        sxoss = sx/ss
-        t = (x-sxoss)/sig
-        st2 = sum(t*t)
-        b = sum(t*y/sig)/st2
-    else:
-        sx = sum(x)
-        sy = sum(y)
-        ss = len(x)
-        sxoss = sx/ss
-        t = (x-sxoss)
-        st2 = sum(t*t)
-        b = sum(t*y)/st2
+    weighted = np.all(sig > 0)
+    wt = 1./sig**2 if weighted else np.ones(len(x))
+
+    # Closed-form weighted sums, centered on weighted mean of x for numerical stability
+    ss = wt.sum()
+    sx = wt.dot(x)
+    sy = wt.dot(y)
+    sxoss = sx/ss
+    t = x - sxoss
+    wtt = wt*t
+    st2 = wtt.dot(t)
+    b = wtt.dot(y)/st2
     a = (sy-sx*b)/ss
-    siga = np.sqrt((1+sx*sx/(ss*st2))/ss)
-    sigb = np.sqrt(1/st2)
-
-    resid = sum((y-a-b*x)**2)
-    syx = np.sqrt(resid/(len(x)-2))
-    cov = -sxoss * sigb**2
-    if not all(sig) > 0:
-        siga = siga * syx
-        sigb = sigb * syx
-        cov = cov * syx*syx
-    elif not absolute_sigma:
-        # See note in scipy.optimize.curve_fit for absolute_sigma parameter.
-        chi2 = sum(((y-a-b*x)/sig)**2)/(len(x)-2)
-        siga, sigb, cov = np.sqrt(siga**2*chi2), np.sqrt(sigb**2*chi2), cov*chi2
-    #rab = -sxoss * sigb / siga  # Correlation can be computed this way
-    return Fit(np.array([b, a]), np.array([[sigb**2, cov], [cov, siga**2]]))
+    vara = (1+sx*sx/(ss*st2))/ss
+    varb = 1/st2
+    cov = -sxoss * varb
+
+    # Residuals are only needed to scale the covariance
+    if not weighted or not absolute_sigma:
+        resid = y - a - b*x
+        if not weighted:
+            scale = resid.dot(resid)/(len(x)-2)  # Syx**2
+        else:
+            # See note in scipy.optimize.curve_fit for absolute_sigma parameter.
+            scale = (wt*resid).dot(resid)/(len(x)-2)  # chi2
+        vara, varb, cov = vara*scale, varb*scale, cov*scale
+    #rab = cov / np.sqrt(vara*varb)  # Correlation can be computed this way
+    return Fit(np.array([b, a]), np.array([[varb, cov], [cov, vara]]))
+
+
+def linefit_batch(x, y, sig=None, absolute_sigma=True):
+    ''' Fit lines, with uncertainty in y (but not x), to many sets of x, y values.
+        Same algorithm as linefit, with sums reduced along the first axis so
+        all sets are fit together.
+
+        Parameters
+        ----------
+        x: array
+            X values of fit. Either 1D with length N, shared by all sets of y values,
+            or 2D with shape (N, sets) giving the x values of each set.
+        y: array
+            2D array of Y values, shape (N, sets). Each column is fit separately.
+        sig: float or array, optional
+            Uncertainty in y values. Scalar, 1D with length N (shared by all sets),
+            or 2D with shape (N, sets). If any sig is 0 or None, all fits are unweighted
+            and sigma is estimated from the residuals of each fit.
+        absolute_sigma: boolean
+            Treat uncertainties in an absolute sense. If false, only relative
+            magnitudes matter.
+
+        Returns
+        -------
+        coeff: array
+            Coefficients of each line fit [slope, intercept], shape (sets, 2).
+        cov: array
+            Covariance matrix of each fit, shape (sets, 2, 2).
+    '''
+    y = np.asarray(y, dtype=np.float64)
+    x = np.asarray(x, dtype=np.float64)
+    if x.ndim == 1:
+        x = x[:, np.newaxis]
+    sig = np.asarray(0 if sig is None else sig, dtype=np.float64)
+    if sig.ndim == 1:
+        sig = sig[:, np.newaxis]
+    weighted = np.all(sig > 0)
+    wt = np.broadcast_to(1./sig**2 if weighted else 1., y.shape)
+
+    ss = wt.sum(axis=0)
+    sx = (wt*x).sum(axis=0)
+    sy = (wt*y).sum(axis=0)
+    sxoss = sx/ss
+    t = x - sxoss
+    wtt = wt*t
+    st2 = (wtt*t).sum(axis=0)
+    b = (wtt*y).sum(axis=0)/st2
+    a = (sy-sx*b)/ss
+    vara = (1+sx*sx/(ss*st2))/ss
+    varb = 1/st2
+    cov = -sxoss * varb
+
+    if not weighted or not absolute_sigma:
+        resid = y - a - b*x
+        if not weighted:
+            scale = (resid*resid).sum(axis=0)/(len(y)-2)  # Syx**2
+        else:
+            scale = (wt*resid*resid).sum(axis=0)/(len(y)-2)  # chi2
+        vara, varb, cov = vara*scale, varb*scale, cov*scale
+    covmat = np.stack((np.stack((varb, cov), axis=-1), np.stack((cov, vara), axis=-1)), axis=-2)
+    return Fit(np.stack((b, a), axis=-1), covmat)
+
+
+def _york_slope(x, y, wx, wy, rxy, alpha, b, tol=1E-15):
+    ''' Iterate York's equations for the best-fit slope, starting from estimate b.
+        Each iteration reduces with np.dot, without Python-level loops over the data.
+
+        Parameters
+        ----------
+        x, y: arrays
+            X and Y values to fit
+        wx, wy: arrays or floats
+            Weights (1/sigma**2) of x and y values
+        rxy: array or float
+            Correlation coefficient between sigx and sigy
+        alpha: array or float
+            sqrt(wx*wy)
+        b: float
+            Initial estimate of slope
+        tol: float
+            Relative change in slope at which to stop iterating
+
+        Returns
+        -------
+        b: float
+            Slope
+        w: array
+            Weights of each point
+        sumw: float
+            Sum of weights
+        X, Y: float
+            Weighted mean of x and y
+        beta: array
+            Beta values used to compute uncertainty
+    '''
+    # Terms that don't depend on b are computed once, outside the iteration
+    alpha2 = alpha*alpha
+    ralpha = rxy*alpha
+    roveralpha = rxy/alpha
+    sigx2 = 1/wx
+    sigy2 = 1/wy
+    bdiff = np.inf
+    while bdiff > tol:
+        bold = b
+        w = np.broadcast_to(alpha2/(b*b*wy + wx - 2*b*ralpha), x.shape)  # Scalar if all inputs are
+        sumw = w.sum()
+        X = np.dot(w, x)/sumw
+        Y = np.dot(w, y)/sumw
+        U = x - X
+        V = y - Y
+        beta = w * (U*sigy2 + b*V*sigx2 - (b*U + V)*roveralpha)
+        wbeta = w*beta
+        Q1 = np.dot(wbeta, V)
+        Q2 = np.dot(wbeta, U)
+        b = Q1/Q2
+        bdiff = abs((b-bold)/bold)
+    return b, w, sumw, X, Y, beta
 
 
 def linefitYork(x, y, sigx=None, sigy=None, rxy=None, absolute_sigma=True):
@@ -830,54 +1209,33 @@ def linefitYork(x, y, sigx=None, sigy=None, rxy=None, absolute_sigma=True):
         [2] Wehr, Saleska. The long-solved problem of the best-fit straight line:
             application to isotopic mixing lines. Biogeosciences. 14, 17-29 (2017)
     '''
-    # Condition inputs so they're all float64 arrays
+    # Condition inputs to float64. Scalar uncertainties and correlation stay scalar
+    # and broadcast against x and y, rather than being filled out to full arrays.
     x = x.astype(np.float64)
     y = y.astype(np.float64)
-    if sigx is None or len(np.nonzero(sigx)[0]) == 0:
-        sigx = np.full(len(x), 1E-99, dtype=np.float64)   # Don't use 0, but a really small number
-    elif np.isscalar(sigx):
-        sigx = np.full_like(x, sigx)
-
-    if sigy is None or len(np.nonzero(sigy)[0]) == 0:
-        sigy = np.full(len(y), 1E-99, dtype=np.float64)
-    elif np.isscalar(sigy):
-        sigy = np.full_like(x, sigy)
-
+    if sigx is None or not np.any(sigx):
+        sigx = 1E-99   # Don't use 0, but a really small number
+    if sigy is None or not np.any(sigy):
+        sigy = 1E-99
     sigy = np.maximum(sigy, 1E-99)
     sigx = np.maximum(sigx, 1E-99)
+    rxy = np.asarray(0. if rxy is None else rxy, dtype=np.float64)
 
-    if rxy is None:
-        rxy = np.zeros_like(y)
-    elif np.isscalar(rxy):
-        rxy = np.full_like(x, rxy)
-
-    _, b0 = np.polyfit(x, y, deg=1)  # Get initial estimate for slope
-    T = 1E-15
-    b = b0
-    bdiff = np.inf
+    # Initial estimate for slope from unweighted least squares, in closed form
+    xdev = x - x.mean()
+    b0 = np.dot(xdev, y - y.mean()) / np.dot(xdev, xdev)
 
     wx = 1./sigx**2
     wy = 1./sigy**2
     alpha = np.sqrt(wx*wy)
-    while bdiff > T:
-        bold = b
-        w = alpha**2/(b**2 * wy + wx - 2*b*rxy*alpha)
-        sumw = sum(w)
-        X = sum(w*x)/sumw
-        Y = sum(w*y)/sumw
-        U = x - X
-        V = y - Y
-        beta = w * (U/wy + b*V/wx - (b*U + V)*rxy/alpha)
-        Q1 = sum(w*beta*V)
-        Q2 = sum(w*beta*U)
-        b = Q1/Q2
-        bdiff = abs((b-bold)/bold)
+    b, w, sumw, X, Y, beta = _york_slope(x, y, wx, wy, rxy, alpha, b0)
     a = Y - b*X
 
     # Uncertainties
     xi = X + beta
-    xbar = sum(w*xi) / sumw
-    sigb = np.sqrt(1./sum(w * (xi - xbar)**2))
+    xbar = np.dot(w, xi) / sumw
+    xidev = xi - xbar
+    sigb = np.sqrt(1./np.dot(w, xidev*xidev))
     siga = np.sqrt(xbar**2 * sigb**2 + 1/sumw)
     #resid = sum((y-b*x-a)**2)
 
@@ -887,6 +1245,7 @@ def linefitYork(x, y, sigx=None, sigy=None, rxy=None, absolute_sigma=True):
 
     if not absolute_sigma:
         # See note in scipy.optimize.curve_fit for absolute_sigma parameter.
-        chi2 = sum(((y-a-b*x)*np.sqrt(w))**2)/(len(x)-2)
+        resid = y-a-b*x
+        chi2 = np.dot(w, resid*resid)/(len(x)-2)
         siga, sigb, cov = np.sqrt(siga**2*chi2), np.sqrt(sigb**2*chi2), cov*chi2
     return Fit(np.array([b, a]), np.array([[sigb**2, cov], [cov, siga**2]]))
@@ -43,22 +43,24 @@ def fitpoly(x, y, m=1):
     TTinv = np.linalg.inv(T.T @ T)
     b = TTinv @ T.T @ y                             # Castrup (6)
 
-    rss = sum((y - y_pred(x, b))**2)                # Castrup (5)
+    resid = y - y_pred(x, b)
+    rss = np.dot(resid, resid)                      # Castrup (5)
     s2 = rss / (len(x)-m)                           # Castrup (10)
     S = s2 * np.eye(m)                              # Castrup (9)
     cov = TTinv @ S                                 # Castrup (8)
     return b, cov, np.sqrt(s2)
 
 
+def _tprime(x, m):
+    ''' Matrix with rows [x, x**2, ... x**m] for each x value '''
+    x = np.atleast_1d(x).astype(float)
+    return x[:, np.newaxis] ** np.arange(1, m+1)
+
+
 def y_pred(x, b, y0=0):
     ''' Predict y at the x value given b polynomial coefficients from fitpoly() '''
     scalar = not np.asarray(x).shape
-    x = np.atleast_1d(x)
-    y = np.zeros(len(x))
-    m = len(b)
-    for i, xval in enumerate(x):
-        tprime = np.array([xval**n for n in range(1, m+1)])
-        y[i] = tprime @ b                           # Castrup (12)
+    y = _tprime(x, len(b)) @ b                      # Castrup (12)
     if scalar:
         return y0 + y[0]
     else:
@@ -68,13 +70,9 @@ def y_pred(x, b, y0=0):
 def u_pred(x, b, cov, syx):
     ''' Prediction band at x (based on residual scatter) '''
     scalar = not np.asarray(x).shape
-    x = np.atleast_1d(x)
-    upred = np.zeros(len(x))
-    m = len(b)
-    for i, xval in enumerate(x):
-        tprime = np.array([xval**n for n in range(1, m+1)])
-        # upred[i] = syx * np.sqrt(1 + tprime.T @ cov @ tprime)  # Castrup (19) appears to be wrong???
-        upred[i] = np.sqrt(syx**2 + (tprime.T @ cov @ tprime))
+    tprime = _tprime(x, len(b))
+    # upred = syx * np.sqrt(1 + tprime.T @ cov @ tprime)  # Castrup (19) appears to be wrong???
+    upred = np.sqrt(syx**2 + np.einsum('ij,jk,ik->i', tprime, cov, tprime))
     if scalar:
         return upred[0]
     else:
@@ -84,12 +82,8 @@ def u_pred(x, b, cov, syx):
 def u_conf(x, b, cov):
     ''' Confidence band at x (based on residual scatter) '''
     scalar = not np.asarray(x).shape
-    x = np.atleast_1d(x)
-    uconf = np.zeros(len(x))
-    m = len(b)
-    for i, xval in enumerate(x):
-        tprime = np.array([xval**n for n in range(1, m+1)])
-        uconf[i] = np.sqrt(tprime.T @ cov @ tprime)
+    tprime = _tprime(x, len(b))
+    uconf = np.sqrt(np.einsum('ij,jk,ik->i', tprime, cov, tprime))
     if scalar:
         return uconf[0]
     else:
@@ -205,15 +199,15 @@ class VariablesInterval(object):
         else:
             k = t_factor(self.rconf, len(self.t)-self.m)
 
-        if all(self.out.fit.b == 0):
+        if not np.any(self.out.fit.b):
             # NO slope. Interval is infinite
             interval = np.inf
         else:
             def upper_lim(t):
-                return y_pred(t, self.out.fit.b, y0=self.y0) + k * np.sqrt(self.u0**2 + u_pred(t, self.out.fit.b, self.out.fit.cov, self.out.fit.syx)**2)
+                return y_pred(t, self.out.fit.b, y0=self.y0) + k * np.hypot(self.u0, u_pred(t, self.out.fit.b, self.out.fit.cov, self.out.fit.syx))
 
             def lower_lim(t):
-                return y_pred(t, self.out.fit.b, y0=self.y0) - k * np.sqrt(self.u0**2 + u_pred(t, self.out.fit.b, self.out.fit.cov, self.out.fit.syx)**2)
+                return y_pred(t, self.out.fit.b, y0=self.y0) - k * np.hypot(self.u0, u_pred(t, self.out.fit.b, self.out.fit.cov, self.out.fit.syx))
 
             t = []
             if (UL is not None and upper_lim(0) > UL) or (LL is not None and lower_lim(0) < LL):
@@ -638,14 +632,14 @@ class FitOutput(output.Output):
             k = kwargs.get('k')
         else:
             k = t_factor(kwargs.get('conf', 0.95), len(self.t)-len(self.b))
-        return y_pred(x, self.b, self.y0), k * np.sqrt(u_pred(x, self.b, self.cov, self.syx)**2 + self.u0**2)
+        return y_pred(x, self.b, self.y0), k * np.hypot(u_pred(x, self.b, self.cov, self.syx), self.u0)
 
     def plot(self, conf=.95):
         ''' Plot fit line '''
         xx = np.linspace(0, self.t.max())
         fit = y_pred(xx, self.b)
         k = t_factor(conf, len(self.t)-len(self.b))
-        upred = k*np.sqrt(u_pred(xx, self.b, self.cov, self.syx)**2 + self.u0**2)
+        upred = k*np.hypot(u_pred(xx, self.b, self.cov, self.syx), self.u0)
 
         with mpl.style.context(plotting.plotstyle):
             fig = plt.figure()
@@ -691,7 +685,7 @@ class IntervalUncertOutput(output.Output):
         ''' Plot the interval, fit line, limits, etc. '''
         xx = np.linspace(0, max(self.interval, self.t.max()))
         fit = y_pred(xx, self.b)
-        upred = np.sqrt(u_pred(xx, self.b, self.cov, self.syx)**2 + self.u0**2)
+        upred = np.hypot(u_pred(xx, self.b, self.cov, self.syx), self.u0)
 
         with mpl.style.context(plotting.plotstyle):
             if fig is None:
@@ -753,7 +747,7 @@ class IntervalReliabilityOutput(output.Output):
         tmax = max(t, x.max())
         xx = np.linspace(0, tmax)
         fit = y_pred(xx, self.b, y0=y0)
-        upred = np.sqrt(u_pred(xx, self.b, self.cov, self.syx)**2 + self.u0**2)
+        upred = np.hypot(u_pred(xx, self.b, self.cov, self.syx), self.u0)
 
         with mpl.style.context(plotting.plotstyle):
             if fig is None:
@@ -2,7 +2,6 @@
 
 import sympy
 from scipy import stats
-from scipy import interpolate, optimize
 import numpy as np
 from contextlib import suppress
 from dateutil.parser import parse
@@ -16,6 +15,23 @@ from . import plotting
 from .ttable import t_factor
 
 
+def _correlation(cov, uncerts):
+    ''' Correlation matrix from covariance and standard uncertainties (see numpy code for corrcoeff) '''
+    invsig = 1 / uncerts
+    return cov * np.outer(invsig, invsig)
+
+
+def _interp_extrap(x, xp, fp):
+    ''' Linear interpolation of fp(xp) at x, extrapolating linearly past the ends.
+        xp must be sorted in increasing order.
+    '''
+    x = np.asarray(x, dtype=float)
+    y = np.interp(x, xp, fp)
+    y = np.where(x < xp[0], fp[0] + (x - xp[0]) * (fp[1] - fp[0]) / (xp[1] - xp[0]), y)
+    y = np.where(x > xp[-1], fp[-1] + (x - xp[-1]) * (fp[-1] - fp[-2]) / (xp[-1] - xp[-2]), y)
+    return y
+
+
 class CurveFitOutputLSQ(output.Output):
     ''' Results from least squares (and maybe GUM?) method calculation '''
     def __init__(self, model, inputs):
@@ -26,6 +42,8 @@ class CurveFitOutputLSQ(output.Output):
         self.paramnames = self.model.pnames
         self.fitfunc = self.model.func
         self.predmode = 'Syx'
+        self._confcache = None  # (key, variance) of last confidence band evaluation
+        self._sigysorted = None  # (x, sigy) sorted by x, for 'sigy' prediction mode
         self._calccoeffs()
 
     def _calccoeffs(self):
@@ -36,7 +54,8 @@ class CurveFitOutputLSQ(output.Output):
         self.cov = result.covariance
         self.degf = result.degf
         self.residuals = result.residuals
-        self.cor = self.cov / self.uncerts[:, None] / self.uncerts[None, :]  # See numpy code for corrcoeff
+        self.yfit = result.yfit
+        self.cor = _correlation(self.cov, self.uncerts)
 
     def _index(self, idx):
         return self.paramnames.index(idx) if isinstance(idx, str) else idx
@@ -60,14 +79,31 @@ class CurveFitOutputLSQ(output.Output):
         if conf is not None:
             k = t_factor(conf, self.degf)
 
-        dp = self.uncerts / 1E6
-        band = []
-        for xval in np.atleast_1d(x):
-            grad = optimize.approx_fprime(self.coeffs, lambda p: self.fitfunc(xval, *p), epsilon=dp)
-            band.append(grad.T @ np.atleast_2d(self.cov) @ grad)
-        band = k * np.sqrt(np.array(band))
+        band = k * np.sqrt(self._conf_variance(np.atleast_1d(x)))
         return band[0] if np.isscalar(x) else band
 
+    def _conf_variance(self, xarr):
+        ''' Variance of fit curve at each x value, from gradient and covariance of the
+            fit parameters. The last result is kept since the plots and reports
+            typically evaluate confidence and prediction bands on the same x values.
+        '''
+        coeffs = np.asarray(self.coeffs, dtype=float)
+        key = (xarr.shape, xarr.dtype, xarr.tobytes(), coeffs.tobytes())
+        if self._confcache is not None and self._confcache[0] == key:
+            return self._confcache[1]
+
+        # Forward-difference gradient with respect to each parameter, at all x values at once
+        y0 = self.fitfunc(xarr, *coeffs)
+        grad = np.empty((len(xarr), len(coeffs)))
+        p = coeffs.copy()
+        for i, dp in enumerate(self.uncerts / 1E6):
+            p[i] = coeffs[i] + dp
+            grad[:, i] = (self.fitfunc(xarr, *p) - y0) / (p[i] - coeffs[i])
+            p[i] = coeffs[i]
+        variance = np.einsum('ij,jk,ik->i', grad, np.atleast_2d(self.cov), grad)
+        self._confcache = (key, variance)
+        return variance
+
     def u_pred(self, x, k=1, conf=None, mode=None, **kwargs):
         ''' Calculate prediction band for fit curve for arbitrary nonlinear regression.
 
@@ -110,18 +146,28 @@ class CurveFitOutputLSQ(output.Output):
             if sigy.min() == sigy.max():  # All elements equal
                 uy = sigy[0]
             else:
-                arrx = self.inputs.x
-                if not np.all(np.diff(arrx) > 0):  # np.interp requires sorted data
-                    idx = np.argsort(arrx)
-                    arrx = arrx[idx]
-                    sigy = sigy[idx]
-                uy = interpolate.interp1d(arrx, sigy, fill_value='extrapolate')(x)
+                if self._sigysorted is None:  # Inputs are fixed for this output, sort only once
+                    idx = np.argsort(self.inputs.x)
+                    self._sigysorted = self.inputs.x[idx], sigy[idx]
+                uy = _interp_extrap(x, *self._sigysorted)
         elif mode == 'sigylast':
             uy = sigy[-1]
 
         if conf is not None:
             k = t_factor(conf, self.degf)
-        return k * np.sqrt(self.u_conf(x, k=1)**2 + uy**2)
+        return k * np.hypot(self.u_conf(x, k=1), uy)
+
+    def confidence_dist(self, x):
+        ''' Get mean, standard deviation, and degrees of freedom of the fit curve at x
+            using the confidence band, as a distribution parameter dictionary.
+        '''
+        return {'mean': self.y(x), 'std': self.u_conf(x), 'df': self.degf}
+
+    def prediction_dist(self, x):
+        ''' Get mean, standard deviation, and degrees of freedom of a new measurement at x
+            using the prediction band, as a distribution parameter dictionary.
+        '''
+        return {'mean': self.y(x), 'std': self.u_pred(x), 'df': self.degf}
 
     def u_pred_dist(self, x, mode=None):
         ''' Get prediction band distribution at x.
@@ -293,7 +339,8 @@ class CurveFitOutputLSQ(output.Output):
         uy = self.residuals.Syx
         # sigy can be scalar or array function of x. Interpolate/average (linearly) over interval if necessary
         if not np.isscalar(uy):
-            uy1, uy2 = interpolate.interp1d(self._inputx(), uy, fill_value='extrapolate')([t1, t2])
+            idx = np.argsort(self._inputx())
+            uy1, uy2 = _interp_extrap([t1, t2], self._inputx()[idx], uy[idx])
             uy = np.sqrt((uy1**2 + uy2**2) / 2)  # Average over interval
 
         subs = {'t1': t1,
@@ -407,15 +454,16 @@ class CurveFitOutputLSQ(output.Output):
         else:
             xstring = [str(k) for k in x]
         resid = self.residuals.residuals
+        confband = self.u_conf(x, k=k, conf=conf)
+        predband = self.u_pred(x, k=k, conf=conf)
         rows = []
         for i in range(len(x)):
-            confband = self.u_conf(x[i], k=k, conf=conf)
             rows.append(['{}'.format(xstring[i]),
-                         report.Number(y[i], matchto=confband),
-                         report.Number(self.y(x[i]), matchto=confband),
-                         report.Number(resid[i], matchto=confband),
-                         report.Number(confband),
-                         report.Number(self.u_pred(x[i], k=k, conf=conf))])
+                         report.Number(y[i], matchto=confband[i]),
+                         report.Number(self.yfit[i], matchto=confband[i]),
+                         report.Number(resid[i], matchto=confband[i]),
+                         report.Number(confband[i]),
+                         report.Number(predband[i])])
         r.table(rows, hdr=hdr)
         return r
 
@@ -828,7 +876,7 @@ class CurveFitOutputLSQ(output.Output):
                 B. Slinker. McGraw-Hill, 2001., pg 130
         '''
         resid = self.residuals.residuals.copy()
-        sy = np.sqrt(sum(resid**2)/(len(resid)-2))
+        sy = np.sqrt(np.dot(resid, resid)/(len(resid)-2))
         resid.sort()
         resid = resid / sy  # Normalized
         Fi = (np.arange(1, len(resid)+1) - 0.5)/len(resid)
@@ -988,8 +1036,9 @@ class CurveFitOutputMC(CurveFitOutputLSQ):
         self.cov = result.covariance
         self.degf = result.degf
         self.residuals = result.residuals
+        self.yfit = result.yfit
         self.samples = result.samples
-        self.cor = self.cov / self.uncerts[:, None] / self.uncerts[None, :]  # See numpy code for corrcoeff
+        self.cor = _correlation(self.cov, self.uncerts)
 
     def plot_samples(self, fig=None, **kwargs):
         ''' Plot samples for each parameter (value vs. sample number) '''
@@ -1052,9 +1101,10 @@ class CurveFitOutputMCMC(CurveFitOutputMC):
         self.cov = result.covariance
         self.degf = result.degf
         self.residuals = result.residuals
+        self.yfit = result.yfit
         self.samples = result.samples
         self.acceptance = result.acceptance
-        self.cor = self.cov / self.uncerts[:, None] / self.uncerts[None, :]  # See numpy code for corrcoeff
+        self.cor = _correlation(self.cov, self.uncerts)
 
     def report_acceptance(self, **kwargs):
         ''' Report acceptance rate (MCMC fits only) '''
@@ -1077,8 +1127,9 @@ class CurveFitOutputGUM(CurveFitOutputLSQ):
         self.cov = result.covariance
         self.degf = result.degf
         self.residuals = result.residuals
+        self.yfit = result.yfit
         self.samples = result.samples
-        self.cor = self.cov / self.uncerts[:, None] / self.uncerts[None, :]  # See numpy code for corrcoeff
+        self.cor = _correlation(self.cov, self.uncerts)
 
 
 class CurveFitOutput(output.Output):
@@ -1173,10 +1224,10 @@ class CurveFitOutput(output.Output):
                 out = getattr(self, method)
                 dists[f'Confidence ({method.upper()})'] = \
                         {'xdates': self.inputs.xdate,
-                         'function': lambda x, out=out: {'mean': out.y(x), 'std': out.u_conf(x), 'df': out.degf}}
+                         'function': out.confidence_dist}
 
                 dists[f'Prediction ({method.upper()})'] = \
                         {'xdates': self.inputs.xdate,
-                         'function': lambda x, out=out: {'mean': out.y(x), 'std': out.u_pred(x), 'df': out.degf}}
+                         'function': out.prediction_dist}
         return dists
 
@@ -158,8 +158,10 @@ class Project(object):
             # file is binary, can't be read as yaml
             return None
 
+        # Use libyaml's C parser when available. Same safe construction as yaml.safe_load.
+        loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
         try:
-            config = yaml.safe_load(yml)
+            config = yaml.load(yml, Loader=loader)
         except yaml.YAMLError:
             return None  # Can't read YAML
 
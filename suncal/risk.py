@@ -32,8 +32,9 @@ from scipy import stats
 from matplotlib.ticker import FormatStrFormatter
 import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d import Axes3D
-from scipy.integrate import dblquad
-from scipy.optimize import brentq, fsolve
+from scipy.integrate import quad
+from scipy.special import ndtr, ndtri
+from scipy.optimize import brentq, fsolve, newton
 
 from . import report
 from . import output
@@ -78,12 +79,13 @@ def specific_risk(dist, LL, UL):
         (See https://www.qualitydigest.com/inside/quality-insider-article/process-performance-indices-nonnormal-distributions.html)
     '''
     LL, UL = min(LL, UL), max(LL, UL)  # make sure LL < UL
-    risk_lower = dist.cdf(LL)
-    risk_upper = 1 - dist.cdf(UL)
+    risk_lower = _dist_cdf(dist, LL)
+    risk_upper = 1 - _dist_cdf(dist, UL)
     risk_total = risk_lower + risk_upper
     if hasattr(dist, 'dist') and hasattr(dist.dist, 'name') and dist.dist.name == 'norm':
         # Normal distributions can use the standard definition of cpk, process capability index
-        cpk = min((UL-dist.mean())/(3*dist.std()), (dist.mean()-LL)/(3*dist.std()))
+        mean, std = _dist_moments(dist)  # Mean equals median for normal
+        cpk = min((UL-mean)/(3*std), (mean-LL)/(3*std))
     else:
         # Non-normal distributions use fractions out.
         # See https://www.qualitydigest.com/inside/quality-insider-article/process-performance-indices-nonnormal-distributions.html
@@ -94,6 +96,90 @@ def specific_risk(dist, LL, UL):
     return Result(cpk, risk_total, risk_lower, risk_upper)
 
 
+def _memoize(func):
+    ''' Cache results of a scalar function of one variable. Root finders may evaluate
+        the same point more than once (fsolve evaluates its starting point twice),
+        and each evaluation here is a numerical integration.
+    '''
+    cache = {}
+
+    def wrapped(x):
+        key = float(np.ravel(x)[0])  # Exact value, so inputs of any magnitude don't collide
+        if key not in cache:
+            cache[key] = func(x)
+        return cache[key]
+    return wrapped
+
+
+_pdfgrid_cache = {}
+_moments_cache = {}
+
+
+def _dist_key(dist):
+    ''' Get hashable key identifying a distribution by its current parameters,
+        or None if the parameters can't be determined. Only distributions built
+        on a named scipy.stats generator have keys. Others (e.g. rv_histogram)
+        keep their parameters on the generator instance, not in the arguments.
+    '''
+    try:
+        gen = dist.dist
+        if type(getattr(stats, gen.name, None)) is not type(gen):
+            return None
+        name = dist.name if isinstance(dist, distributions.Distribution) else gen.name
+        key = (name, tuple(sorted(distributions.get_distargs(dist).items())))
+        hash(key)
+    except (AttributeError, TypeError):
+        return None
+    return key
+
+
+def _dist_moments(dist):
+    ''' Get median and standard deviation of dist, cached by distribution parameters.
+        Each call on a Distribution instance freezes a new scipy distribution,
+        which is slow relative to the GUI and sweep loops that query these values.
+    '''
+    key = _dist_key(dist)
+    if key is not None and key in _moments_cache:
+        return _moments_cache[key]
+
+    moments = dist.median(), dist.std()
+    if key is not None:
+        if len(_moments_cache) >= 64:
+            _moments_cache.clear()
+        _moments_cache[key] = moments
+    return moments
+
+
+def _pdf_grid(dist, num=1000):
+    ''' Tabulate the pdf of dist over +/- 8 standard deviations from its median.
+        Grids are cached by distribution parameters, so repeated PFA/PFR evaluations
+        (e.g. in guardband solvers or sweeps) don't recompute them. Keying on the
+        parameters rather than the object keeps the cache valid when a distribution
+        is modified in place.
+
+        Returns
+        -------
+        xx: array
+            Values where pdf is evaluated
+        pdf: array
+            Probability density at xx
+    '''
+    key = _dist_key(dist)
+    if key is not None:
+        key = key + (num,)
+        if key in _pdfgrid_cache:
+            return _pdfgrid_cache[key]
+
+    median, std = _dist_moments(dist)
+    xx = np.linspace(median - std*8, median + std*8, num=num)
+    grid = xx, dist.pdf(xx)
+    if key is not None:
+        if len(_pdfgrid_cache) >= 32:
+            _pdfgrid_cache.clear()
+        _pdfgrid_cache[key] = grid
+    return grid
+
+
 def guardband_norm(method, TUR, **kwargs):
     ''' Get guardband factor for the TUR (applies to normal-only risk).
 
@@ -153,13 +239,13 @@ def guardband_norm(method, TUR, **kwargs):
         else:
             pfa_target = PFA_norm(itp, TUR=4)
         # In normal case, this is faster than guardband() method
-        GB = fsolve(lambda x: PFA_norm(itp, TUR, GB=x)-pfa_target, x0=.8)[0]
+        GB = fsolve(_memoize(lambda x: PFA_norm(itp, TUR, GB=x)-pfa_target), x0=.8)[0]
     elif method == 'mincost':
         itp = kwargs.get('itp', 0.95)
         Cc_over_Cp = kwargs.get('CcCp', 10)
         conf = 1 - (1 / (1 + Cc_over_Cp))
         sigtest = 1/TUR/2
-        sigprod = 1/stats.norm.ppf((1+itp)/2)
+        sigprod = 1/ndtri((1+itp)/2)
         k = stats.norm.ppf(conf) * np.sqrt(1 + sigtest**2/sigprod**2) - sigtest/sigprod**2
         GB = 1 - k * sigtest
     elif method == 'minimax':
@@ -204,14 +290,103 @@ def guardband(dist_proc, dist_test, LL, UL, target_PFA, testbias=0, approx=False
 
         Notes
         -----
-        Uses Brent's Method to find zero of PFA(dist_proc, dist_test, LL, UL, GBU=x, GBL=x)-target_PFA.
+        Uses the secant method, starting from the RSS guardband, to find zero of
+        PFA(dist_proc, dist_test, LL, UL, GBU=x, GBL=x)-target_PFA. Falls back on
+        Brent's Method if the secant method does not converge, or with approx=True
+        where the discrete PFA is a step function of the guardband.
+    '''
+    pfa, w, gb0 = _guardband_problem(dist_proc, dist_test, LL, UL, testbias, approx)
+    return _solve_guardband(pfa, target_PFA, w, gb0)
+
+
+def guardband_batch(dist_proc, dist_test, LL, UL, target_PFAs, testbias=0, approx=False):
+    ''' Calculate (symmetric) guardbands required to meet each of an array of
+        target PFA values, for arbitrary distributions.
+
+        Parameters
+        ----------
+        dist_proc: stats.rv_frozen or distributions.Distribution
+            Distribution of possible unit under test values from process
+        dist_test: stats.rv_frozen or distributions.Distribution
+            Distribution of possible test measurement values
+        LL: float
+            Lower specification limit (absolute)
+        UL: float
+            Upper specification limit (absolute)
+        target_PFAs: array
+            Probabilities of false accept required
+        testbias: float
+            Bias (difference between distribution median and expected value)
+            in test distribution
+        approx: bool
+            Approximate the integral using discrete probability distribution.
+            Faster than using scipy.integrate.
+
+        Returns
+        -------
+        GB: array
+            Guardband offset required to meet each target PFA, as in guardband().
+
+        Notes
+        -----
+        Equivalent to calling guardband() for each target, but PFA evaluations are
+        shared between targets, and each secant iteration starts from the guardband
+        found for the next-smallest target.
+    '''
+    targets = np.atleast_1d(np.asarray(target_PFAs, dtype=float))
+    pfa, w, gb0 = _guardband_problem(dist_proc, dist_test, LL, UL, testbias, approx)
+    gbs = np.full(len(targets), np.nan)
+    for i in np.argsort(targets):
+        gbs[i] = _solve_guardband(pfa, targets[i], w, gb0)
+        if gb0 is not None and np.isfinite(gbs[i]):
+            gb0 = gbs[i]
+    return gbs
+
+
+def _guardband_problem(dist_proc, dist_test, LL, UL, testbias, approx):
+    ''' Set up the guardband root-finding problem.
+
+        Returns
+        -------
+        pfa: callable
+            Memoized PFA as a function of symmetric guardband offset
+        w: float
+            Width of the range searched for guardband (-w/2 to w/2)
+        gb0: float or None
+            Starting point for secant iteration, or None if the secant method
+            should not be used.
     '''
     w = UL-(LL+UL)/2
     if not np.isfinite(w):
         w = np.nanmax([x for x in [abs(LL), abs(UL), max(dist_proc.std()*4, dist_test.std()*4)] if np.isfinite(x)])
 
+    pfa = _memoize(lambda x: PFA(dist_proc, dist_test, LL, UL, GBU=x, GBL=x, testbias=testbias, approx=approx))
+
+    # With smooth (integrated, not approx) PFA, a secant iteration from the RSS guardband
+    # of a normal test with the same TUR usually converges in a few PFA evaluations.
+    gb0 = None
+    if not approx and np.isfinite(LL) and np.isfinite(UL):
+        tur = (UL-LL)/2 / (2*dist_test.std())
+        gb0 = guardbandfactor_to_offset(guardband_norm('rss', tur), LL, UL) if tur > 1 else 0
+    return pfa, w, gb0
+
+
+def _solve_guardband(pfa, target_PFA, w, gb0=None):
+    ''' Find guardband where pfa(guardband) equals target_PFA. Uses secant
+        method starting from gb0 (if not None), or Brent's method on
+        (-w/2, w/2) if the secant method doesn't converge.
+    '''
+    def func(x):
+        return pfa(x) - target_PFA
+
+    if gb0 is not None:
+        with suppress(RuntimeError):
+            gb = newton(func, x0=gb0, tol=1E-12, maxiter=10)
+            if abs(gb) <= w/2 and abs(func(gb)) <= target_PFA * 1E-4:
+                return gb
+
     try:
-        gb, r = brentq(lambda x: PFA(dist_proc, dist_test, LL, UL, GBU=x, GBL=x, testbias=testbias, approx=approx)-target_PFA, a=-w/2, b=w/2, full_output=True)
+        gb, r = brentq(func, a=-w/2, b=w/2, full_output=True)
     except ValueError:
         return np.nan  # Problem solving
 
@@ -292,7 +467,7 @@ def PFA_norm(itp, TUR, GB=1, biastest=0, biasproc=0, **kwargs):
     '''
     # Convert itp to stdev of process
     # This is T in equation 2 in Dobbert's Guardbanding Strategy, with T = 1.
-    sigma0 = 1/stats.norm.ppf((1+itp)/2)
+    sigma0 = 1/ndtri((1+itp)/2)
     sigmatest = 1/TUR/2
 
     try:
@@ -301,17 +476,18 @@ def PFA_norm(itp, TUR, GB=1, biastest=0, biasproc=0, **kwargs):
         GB = guardband_norm(GB, TUR, itp=itp, **kwargs)
 
     A = GB  # A = T * GB = 1 * GB
+    # The integral over test result t (within acceptance limits) of the normal test distribution
+    # is a difference of normal CDFs, leaving a single integral over the process value y.
+    def integrand(y):
+        return np.exp(-(y-biasproc)**2/2/sigma0**2) * (ndtr((A-y-biastest)/sigmatest) - ndtr((-A-y-biastest)/sigmatest))
+
+    c1, _ = quad(integrand, 1, np.inf)
     if biastest == 0 and biasproc == 0:
-        c, _ = dblquad(lambda y, t: np.exp(-(y-biasproc)**2/2/sigma0**2)*np.exp(-(y-t+biastest)**2/2/sigmatest**2),
-                       -A, A, gfun=1, hfun=np.inf)
-        c *= 2  # Symmetric both sides
+        c = 2 * c1  # Symmetric both sides
     else:
-        c1, _ = dblquad(lambda y, t: np.exp(-(y-biasproc)**2/2/sigma0**2)*np.exp(-(y-t+biastest)**2/2/sigmatest**2),
-                        -A, A, gfun=1, hfun=np.inf)
-        c2, _ = dblquad(lambda y, t: np.exp(-(y-biasproc)**2/2/sigma0**2)*np.exp(-(y-t+biastest)**2/2/sigmatest**2),
-                        -A, A, gfun=-np.inf, hfun=-1)
+        c2, _ = quad(integrand, -np.inf, -1)
         c = c1 + c2
-    c = c / (2 * np.pi * sigmatest * sigma0)
+    c = c / (np.sqrt(2 * np.pi) * sigma0)
     return c
 
 
@@ -337,7 +513,7 @@ def PFR_norm(itp, TUR, GB=1, biastest=0, biasproc=0, **kwargs):
         biasproc: float
             Bias/shift in the process distribution
     '''
-    sigma0 = 1/stats.norm.ppf((1+itp)/2)
+    sigma0 = 1/ndtri((1+itp)/2)
     sigmatest = 1/TUR/2
 
     try:
@@ -346,17 +522,21 @@ def PFR_norm(itp, TUR, GB=1, biastest=0, biasproc=0, **kwargs):
         GB = guardband_norm(GB, TUR, itp=itp, **kwargs)
 
     A = GB
+    # The integral over test result t (outside acceptance limits) of the normal test distribution
+    # is a sum of normal tail probabilities, leaving a single integral over the process value y.
+    def integrand(y):
+        return np.exp(-(y-biasproc)**2/2/sigma0**2) * ndtr((y+biastest-A)/sigmatest)
+
+    def integrand_lower(y):
+        return np.exp(-(y-biasproc)**2/2/sigma0**2) * ndtr((-A-y-biastest)/sigmatest)
+
+    c1, _ = quad(integrand, -1, 1)
     if biastest == 0 and biasproc == 0:
-        c, _ = dblquad(lambda y, t: np.exp(-(y-biasproc)**2/2/sigma0**2)*np.exp(-(y-t+biastest)**2/2/sigmatest**2),
-                       A, np.inf, gfun=-1, hfun=1)
-        c *= 2  # Symmetric both sides
+        c = 2 * c1  # Symmetric both sides
     else:
-        c1, _ = dblquad(lambda y, t: np.exp(-(y-biasproc)**2/2/sigma0**2)*np.exp(-(y-t+biastest)**2/2/sigmatest**2),
-                        A, np.inf, gfun=-1, hfun=1)
-        c2, _ = dblquad(lambda y, t: np.exp(-(y-biasproc)**2/2/sigma0**2)*np.exp(-(y-t+biastest)**2/2/sigmatest**2),
-                        -np.inf, -A, gfun=-1, hfun=1)
+        c2, _ = quad(integrand_lower, -1, 1)
         c = c1 + c2
-    c = c / (2 * np.pi * sigmatest * sigma0)
+    c = c / (np.sqrt(2 * np.pi) * sigma0)
     return c
 
 
@@ -384,8 +564,12 @@ def PFA_deaver(SL, TUR, GB=1):
         ---------
         Equation 6 in Deaver - How to Maintain Confidence
     '''
-    c, _ = dblquad(lambda y, t: np.exp(-(y*y + t*t)/2) / np.pi, SL, np.inf, gfun=lambda t: -TUR*(t+SL*GB), hfun=lambda t: -TUR*(t-SL*GB))
-    return c
+    # Inner integral over the normalized test error is a difference of normal CDFs
+    def integrand(t):
+        return np.exp(-t*t/2) * (ndtr(TUR*(SL*GB-t)) - ndtr(-TUR*(t+SL*GB)))
+
+    c, _ = quad(integrand, SL, np.inf)
+    return c * 2 / np.sqrt(2*np.pi)
 
 
 def PFR_deaver(SL, TUR, GB=1):
@@ -412,8 +596,79 @@ def PFR_deaver(SL, TUR, GB=1):
         ---------
         Equation 7 in Deaver - How to Maintain Confidence
     '''
-    p, _ = dblquad(lambda y, t: np.exp(-(y*y + t*t)/2) / np.pi, -SL, SL, gfun=lambda t: TUR*(GB*SL-t), hfun=lambda t: np.inf)
-    return p
+    # Inner integral over the normalized test error is a normal tail probability
+    def integrand(t):
+        return np.exp(-t*t/2) * ndtr(TUR*(t-GB*SL))
+
+    p, _ = quad(integrand, -SL, SL)
+    return p * 2 / np.sqrt(2*np.pi)
+
+
+def _bind_pdf(dist):
+    ''' Get pdf function of the frozen distribution. Normal distributions use the
+        elementary expression, avoiding scipy's argument checking on every call
+        from an integrator.
+    '''
+    with suppress(AttributeError):
+        if dist.dist.name == 'norm':
+            kwds = distributions.get_distargs(dist)
+            loc, scale = kwds.get('loc', 0), kwds.get('scale', 1)
+            norm = 1 / (scale * np.sqrt(2 * np.pi))
+            return lambda y: norm * np.exp(-0.5*((y-loc)/scale)**2)
+    return dist.pdf
+
+
+def _bind_cdf(dist, kwds):
+    ''' Get cdf and sf functions of (y, loc) for the unfrozen scipy distribution
+        with remaining arguments kwds. Normal distributions use ndtr directly.
+        Other continuous distributions have their shape arguments parsed and
+        checked once here, and call scipy's internal _cdf/_sf with scalar y.
+    '''
+    if getattr(dist, 'name', None) == 'norm':
+        scale = kwds.get('scale', 1)
+        return (lambda y, loc: ndtr((y-loc)/scale),
+                lambda y, loc: ndtr((loc-y)/scale))
+
+    try:
+        shapes, _, scale = dist._parse_args(**kwds)
+        valid = isinstance(dist, stats.rv_continuous) and dist._argcheck(*shapes) and scale > 0
+        a, b = dist._get_support(*shapes)
+    except (AttributeError, TypeError):
+        valid = False
+
+    if not valid:
+        return (lambda y, loc: dist.cdf(y, loc=loc, **kwds),
+                lambda y, loc: dist.sf(y, loc=loc, **kwds))
+
+    def cdf(y, loc):
+        x = (y-loc)/scale
+        if x <= a:
+            return 0.
+        elif x >= b:
+            return 1.
+        return dist._cdf(x, *shapes)
+
+    def sf(y, loc):
+        x = (y-loc)/scale
+        if x <= a:
+            return 1.
+        elif x >= b:
+            return 0.
+        return dist._sf(x, *shapes)
+    return cdf, sf
+
+
+def _dist_cdf(dist, x):
+    ''' Evaluate cdf of the frozen distribution at scalar x, using the bound
+        functions from _bind_cdf rather than freezing a new scipy distribution.
+    '''
+    try:
+        kwds = distributions.get_distargs(dist)
+        loc = kwds.pop('loc', 0)
+        cdf, _ = _bind_cdf(dist.dist, kwds)
+        return cdf(x, loc)
+    except (AttributeError, TypeError):
+        return dist.cdf(x)
 
 
 def PFA(dist_proc, dist_test, LL, UL, GBL=0, GBU=0, testbias=0, approx=False):
@@ -448,11 +703,7 @@ def PFA(dist_proc, dist_test, LL, UL, GBL=0, GBU=0, testbias=0, approx=False):
             Probability of False Accept
     '''
     if approx:
-        xx = np.linspace(dist_proc.median() - dist_proc.std()*8, dist_proc.median() + dist_proc.std()*8, num=1000)
-        xx2 = np.linspace(dist_test.median() - dist_test.std()*8,  dist_test.median() + dist_test.std()*8, num=1000)
-        procpdf = dist_proc.pdf(xx)
-        testpdf = dist_test.pdf(xx2)
-        return _PFA_discrete((xx, procpdf), (xx2, testpdf), LL, UL, GBL=GBL, GBU=GBU, testbias=testbias)
+        return _PFA_discrete(_pdf_grid(dist_proc), _pdf_grid(dist_test), LL, UL, GBL=GBL, GBU=GBU, testbias=testbias)
 
     else:
         # Strip loc keyword from test distribution so it can be changed,
@@ -460,12 +711,20 @@ def PFA(dist_proc, dist_test, LL, UL, GBL=0, GBU=0, testbias=0, approx=False):
         test_expected = dist_test.median() - testbias
         kwds = distributions.get_distargs(dist_test)
         locorig = kwds.pop('loc', 0)
+        shift = test_expected - locorig
+
+        # Integrating the test pdf over the acceptance interval gives a difference of test
+        # cdfs, so only the integral over the process distribution is done numerically.
+        testcdf, _ = _bind_cdf(dist_test.dist, kwds)
+        procpdf = _bind_pdf(dist_proc)
 
-        def integrand(y, t):
-            return dist_test.dist.pdf(y, loc=t-(test_expected-locorig), **kwds) * dist_proc.pdf(y)
+        def integrand(y):
+            accept = testcdf(y, LL+GBL-shift) - testcdf(y, UL-GBU-shift)
+            return accept * procpdf(y)
 
-        c1, _ = dblquad(integrand, LL+GBL, UL-GBU, gfun=UL, hfun=np.inf)
-        c2, _ = dblquad(integrand, LL+GBL, UL-GBU, gfun=-np.inf, hfun=LL)
+        # A one-sided (infinite) limit has no tail beyond it to integrate
+        c1 = quad(integrand, UL, np.inf)[0] if np.isfinite(UL) else 0
+        c2 = quad(integrand, -np.inf, LL)[0] if np.isfinite(LL) else 0
         return c1 + c2
 
 
@@ -513,19 +772,33 @@ def _PFA_discrete(dist_proc, dist_test, LL, UL, GBL=0, GBU=0, testbias=0):
         testx = testx[1:] - dx/2
 
     expected = np.median(testx) - testbias
-    c = 0
-    for t, ut in zip(procx[np.where(procx > UL)], procy[np.where(procx > UL)]):
-        idx = np.where(testx+t-expected < UL-GBU)
-        c += np.trapz(ut*testy[idx], dx=dx)
+    # testx is increasing, so the shifted test values below the upper acceptance limit are
+    # a prefix of testx, and those above the lower acceptance limit are a suffix.
+    # Evaluate every process value at once, with one row per process value.
+    upper = procx > UL
+    nacc = np.count_nonzero(testx + procx[upper][:, np.newaxis] - expected < UL-GBU, axis=1)
+    c = np.dot(procy[upper], _trapz_range(testy, 0, nacc, dx))
 
-    for t, ut in zip(procx[np.where(procx < LL)], procy[np.where(procx < LL)]):
-        idx = np.where(testx+t-expected > LL+GBL)
-        c += np.trapz(ut*testy[idx], dx=dx)
+    lower = procx < LL
+    start = len(testx) - np.count_nonzero(testx + procx[lower][:, np.newaxis] - expected > LL+GBL, axis=1)
+    c += np.dot(procy[lower], _trapz_range(testy, start, len(testx), dx))
 
     c *= dy
     return c
 
 
+def _trapz_range(y, start, stop, dx):
+    ''' Trapezoidal integral of y[start:stop], with uniform spacing dx, for
+        arrays of start and/or stop indices. Same as np.trapz on each slice.
+    '''
+    csum = np.concatenate(([0.], np.cumsum(y)))
+    start, stop = np.broadcast_arrays(start, stop)
+    first = y[np.minimum(start, len(y)-1)]
+    last = y[np.maximum(stop-1, 0)]
+    area = (csum[stop] - csum[start] - (first + last)/2) * dx
+    return np.where(stop > start, area, 0.)
+
+
 def PFR(dist_proc, dist_test, LL, UL, GBL=0, GBU=0, testbias=0, approx=False):
     ''' Calculate Probability of False Reject (Producer Risk) for arbitrary
         process and test distributions.
@@ -558,11 +831,7 @@ def PFR(dist_proc, dist_test, LL, UL, GBL=0, GBU=0, testbias=0, approx=False):
             Probability of False Reject
     '''
     if approx:
-        xx = np.linspace(dist_proc.median() - dist_proc.std()*8, dist_proc.median() + dist_proc.std()*8, num=1000)
-        xx2 = np.linspace(dist_test.median() - dist_test.std()*8,  dist_test.median() + dist_test.std()*8, num=1000)
-        procpdf = dist_proc.pdf(xx)
-        testpdf = dist_test.pdf(xx2)
-        return _PFR_discrete((xx, procpdf), (xx2, testpdf), LL, UL, GBL=GBL, GBU=GBU, testbias=testbias)
+        return _PFR_discrete(_pdf_grid(dist_proc), _pdf_grid(dist_test), LL, UL, GBL=GBL, GBU=GBU, testbias=testbias)
 
     else:
         # Strip loc keyword from test distribution so it can be changed,
@@ -570,13 +839,19 @@ def PFR(dist_proc, dist_test, LL, UL, GBL=0, GBU=0, testbias=0, approx=False):
         expected = dist_test.median() - testbias
         kwds = distributions.get_distargs(dist_test)
         locorig = kwds.pop('loc', 0)
+        shift = expected - locorig
 
-        def integrand(y, t):
-            return dist_test.dist.pdf(y, loc=t-(expected-locorig), **kwds) * dist_proc.pdf(y)
+        # Integrating the test pdf outside the acceptance interval gives test cdf
+        # and sf terms, so only the integral over the process distribution is done numerically.
+        testcdf, testsf = _bind_cdf(dist_test.dist, kwds)
+        procpdf = _bind_pdf(dist_proc)
 
-        p1, _ = dblquad(integrand, UL-GBU, np.inf, gfun=LL, hfun=UL)
-        p2, _ = dblquad(integrand, -np.inf, LL+GBL, gfun=LL, hfun=UL)
-        return p1 + p2
+        def integrand(y):
+            reject = testcdf(y, UL-GBU-shift) + testsf(y, LL+GBL-shift)
+            return reject * procpdf(y)
+
+        p, _ = quad(integrand, LL, UL)
+        return p
 
 
 def _PFR_discrete(dist_proc, dist_test, LL, UL, GBL=0, GBU=0, testbias=0):
@@ -623,12 +898,14 @@ def _PFR_discrete(dist_proc, dist_test, LL, UL, GBL=0, GBU=0, testbias=0):
         testx = testx[1:] - dx/2
 
     expected = np.median(testx) - testbias
-    c = 0
-    for t, ut in zip(procx[np.where((procx > LL) & (procx < UL))], procy[np.where((procx > LL) & (procx < UL))]):
-        idx = np.where(testx+t-expected > UL-GBU)
-        c += np.trapz(ut*testy[idx], dx=dx)
-        idx = np.where(testx+t-expected < LL+GBL)
-        c += np.trapz(ut*testy[idx], dx=dx)
+    # testx is increasing, so the shifted test values above the upper acceptance limit are
+    # a suffix of testx, and those below the lower acceptance limit are a prefix.
+    # Evaluate every process value at once, with one row per process value.
+    inspec = (procx > LL) & (procx < UL)
+    shifted = testx + procx[inspec][:, np.newaxis] - expected
+    start = len(testx) - np.count_nonzero(shifted > UL-GBU, axis=1)
+    nrej = np.count_nonzero(shifted < LL+GBL, axis=1)
+    c = np.dot(procy[inspec], _trapz_range(testy, start, len(testx), dx) + _trapz_range(testy, 0, nrej, dx))
 
     c *= dy
     return c
@@ -682,11 +959,30 @@ def PFAR_MC(dist_proc, dist_test, LL, UL, GBL=0, GBU=0, N=100000, testbias=0):
         test_samples = np.array([])
         return Result(np.nan, np.nan, None, None)
 
-    FA = np.count_nonzero(((test_samples < UL-GBU) & (test_samples > LL+GBL)) & ((proc_samples > UL) | (proc_samples < LL))) / N
-    FR = np.count_nonzero(((test_samples > UL-GBU) | (test_samples < LL+GBL)) & ((proc_samples < UL) & (proc_samples > LL))) / N
+    false_accept, false_reject = _classify_samples(proc_samples, test_samples, LL, UL, GBL, GBU)
+    FA = np.count_nonzero(false_accept) / N
+    FR = np.count_nonzero(false_reject) / N
     return Result(FA, FR, proc_samples, test_samples)
 
 
+def _classify_samples(proc_samples, test_samples, LL, UL, GBL=0, GBU=0):
+    ''' Get boolean masks of false accept and false reject Monte Carlo samples.
+        Each sample is compared once against each limit, combining the masks in place.
+        Samples exactly on a limit are neither in nor out, accepted nor rejected.
+    '''
+    accept = test_samples < UL-GBU
+    accept &= test_samples > LL+GBL
+    reject = test_samples > UL-GBU
+    reject |= test_samples < LL+GBL
+    inspec = proc_samples < UL
+    inspec &= proc_samples > LL
+    outspec = proc_samples > UL
+    outspec |= proc_samples < LL
+    accept &= outspec
+    reject &= inspec
+    return accept, reject
+
+
 def PFA_sweep_simple(xvar='itp', zvar='TUR', xvals=None, zvals=None,
                      GBFdflt=1, itpdflt=.95, TURdflt=4, tbias=0, pbias=0, risk='PFA'):
     ''' Sweep PFA vs. itp, tur, or gbf for producing risk curves in simple mode
@@ -930,7 +1226,7 @@ class Risk(object):
                 In-tolerance probability (0-1)
         '''
         self.to_simple()
-        sigma = self.speclimits[1] / stats.norm.ppf((1+itp)/2)
+        sigma = self.speclimits[1] / ndtri((1+itp)/2)
         self.procdist = distributions.get_distribution('normal', loc=0, std=sigma)
 
     def set_tur(self, tur):
@@ -943,7 +1239,7 @@ class Risk(object):
         '''
         self.to_simple()
         sigma = 1/tur/2
-        median = self.testdist.median()
+        median = _dist_moments(self.testdist)[0]
         self.testdist = distributions.get_distribution('normal', loc=median, std=sigma)
 
     def set_testmedian(self, median):
@@ -954,7 +1250,7 @@ class Risk(object):
             median: float
                 Median value of a particular test measurement result
         '''
-        sigma = self.testdist.std()
+        sigma = _dist_moments(self.testdist)[1]
         self.testdist = distributions.get_distribution('normal', loc=median, std=sigma)
 
     def set_costs(self, FA, FR):
@@ -964,13 +1260,13 @@ class Risk(object):
 
     def get_testmedian(self):
         ''' Get test measurement median '''
-        return self.testdist.median()
+        return _dist_moments(self.testdist)[0]
 
     def is_simple(self):
         ''' Check if simplified normal-only functions can be used '''
         if self.procdist is None or self.testdist is None:
             return False
-        if self.procdist.median() != 0 or self.testbias != 0:
+        if _dist_moments(self.procdist)[0] != 0 or self.testbias != 0:
             return False
         if self.procdist.name != 'normal' or self.testdist.name != 'normal':
             return False
@@ -988,12 +1284,12 @@ class Risk(object):
         # Get existing parameters
         tur = self.get_tur() if self.testdist is not None else 4
         itp = self.get_itp() if self.procdist is not None else 0.95
-        median = self.testdist.median() if self.testdist is not None else 0
+        median = _dist_moments(self.testdist)[0] if self.testdist is not None else 0
         gbf = self.get_gbf()
 
         # Convert to normal/symmetric
         self.set_speclimits(-1, 1)
-        sigma0 = self.speclimits[1] / stats.norm.ppf((1+itp)/2)
+        sigma0 = self.speclimits[1] / ndtri((1+itp)/2)
         self.procdist = distributions.get_distribution('normal', loc=0, std=sigma0)
         sigmat = 1/tur/2
         self.testdist = distributions.get_distribution('normal', loc=median, std=sigmat)
@@ -1004,7 +1300,7 @@ class Risk(object):
             Speclimit range / Expanded test measurement uncertainty.
         '''
         rng = (self.speclimits[1] - self.speclimits[0])/2   # Half the interval
-        TL = self.testdist.std() * 2   # k=2
+        TL = _dist_moments(self.testdist)[1] * 2   # k=2
         return rng/TL
 
     def get_itp(self):
@@ -1141,15 +1437,17 @@ class Risk(object):
             accept: bool
                 Accept or reject this measurement
         '''
-        med = self.testdist.median() + self.testbias
+        med = _dist_moments(self.testdist)[0] + self.testbias
         LL, UL = self.speclimits
         LL, UL = min(LL, UL), max(LL, UL)  # Make sure LL < UL
-        accept = (med >= LL + self.guardband[0] and med <= UL - self.guardband[0])
+        accept = LL + self.guardband[0] <= med <= UL - self.guardband[0]
 
-        if med >= LL + self.guardband[0] and med <= UL - self.guardband[0]:
-            PFx = self.testdist.cdf(LL) + (1 - self.testdist.cdf(UL))
+        cdf_lower = _dist_cdf(self.testdist, LL)
+        cdf_upper = _dist_cdf(self.testdist, UL)
+        if accept:
+            PFx = cdf_lower + (1 - cdf_upper)
         else:
-            PFx = abs(self.testdist.cdf(LL) - self.testdist.cdf(UL))
+            PFx = abs(cdf_lower - cdf_upper)
         return PFx, accept
 
     # Extra functions for GUI
@@ -1212,12 +1510,12 @@ class Risk(object):
                 File name or file object to save to
         '''
         d = self.get_config()
-        out = yaml.dump([d], default_flow_style=False)
-        try:
-            fname.write(out)
-        except AttributeError:
+        # Let yaml write directly to the file rather than building the whole string first
+        if hasattr(fname, 'write'):
+            yaml.dump([d], fname, default_flow_style=False)
+        else:
             with open(fname, 'w') as f:
-                f.write(out)
+                yaml.dump([d], f, default_flow_style=False)
 
     @classmethod
     def from_config(cls, config):
@@ -1253,18 +1551,18 @@ class Risk(object):
             fname: string or file
                 File name or open file object to read configuration from
         '''
+        # Use libyaml's C parser when available. Same safe construction as yaml.safe_load.
+        # The parser reads from the file stream directly.
+        loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
         try:
-            try:
-                yml = fname.read()  # fname is file object
-            except AttributeError:
+            if hasattr(fname, 'read'):  # fname is file object
+                config = yaml.load(fname, Loader=loader)
+            else:
                 with open(fname, 'r') as fobj:  # fname is string
-                    yml = fobj.read()
+                    config = yaml.load(fobj, Loader=loader)
         except UnicodeDecodeError:
             # file is binary, can't be read as yaml
             return None
-
-        try:
-            config = yaml.safe_load(yml)
         except yaml.YAMLError:
             return None  # Can't read YAML
 
@@ -1279,6 +1577,8 @@ class RiskOutput(output.Output):
     def __init__(self, risk, labelsigma=False):
         self.risk = risk
         self.labelsigma = labelsigma
+        self._curvekey = None  # Parameters of cached plot_dists curves
+        self._curves = None
 
     def report(self, **kwargs):
         ''' Generate report of risk calculation '''
@@ -1297,15 +1597,15 @@ class RiskOutput(output.Output):
                 cost = self.risk.cost_FA * risk_total  # Everything accepted - no false rejects
 
         if self.risk.get_testdist() is not None:
-            val = self.risk.get_testdist().median() + self.risk.get_testbias()
+            val = self.risk.get_testmedian() + self.risk.get_testbias()
             PFx, accept = self.risk.test_risk()  # Get PFA/PFR of specific measurement
 
             hdr.extend(['Specific Measurement Risk'])
             cols.append([
                 ('TUR: ', report.Number(self.risk.get_tur(), fmt='auto')),
                 ('Measured value: ', report.Number(val)),
-                'Result: {}'.format('ACCEPT' if accept else 'REJECT'),
-                ('Specific F{} Risk: '.format('A' if accept else 'R'), report.Number(PFx*100, fmt='auto'), '%'),
+                f'Result: {"ACCEPT" if accept else "REJECT"}',
+                (f'Specific F{"A" if accept else "R"} Risk: ', report.Number(PFx*100, fmt='auto'), '%'),
                 ])
 
         if self.risk.get_testdist() is not None and self.risk.get_procdist() is not None:
@@ -1320,7 +1620,7 @@ class RiskOutput(output.Output):
 
         rpt = report.Report()
         if len(hdr) > 0:
-            rows = list(map(list, zip(*cols)))  # Transpose cols->rows
+            rows = list(zip(*cols))  # Transpose cols->rows. Table iterates rows twice, so keep a list.
             rpt.table(rows=rows, hdr=hdr)
 
         if cost is not None:
@@ -1331,7 +1631,14 @@ class RiskOutput(output.Output):
         return rpt
 
     def report_all(self, **kwargs):
-        ''' Report with table and plots '''
+        ''' Report with table and plots. Pass noplot=True to get only the
+            text report, without creating any figures.
+        '''
+        if kwargs.get('noplot', False):
+            if kwargs.get('mc', False):
+                return self.report_montecarlo(**kwargs)
+            return self.report(**kwargs)
+
         if kwargs.get('mc', False):
             with plt.style.context(plotting.plotstyle):
                 fig = plt.figure()
@@ -1362,21 +1669,14 @@ class RiskOutput(output.Output):
             LL, UL = self.risk.get_speclimits()
             GBL, GBU = self.risk.get_guardband()
 
-            # Add some room on either side of distributions
-            pad = 0
+            x, yproc, ytest = self._pdf_curves(procdist, testdist, LL, UL)
+            outside = (x <= LL) | (x >= UL)
             if procdist is not None:
-                pad = max(pad, procdist.std() * 3)
-            if testdist is not None:
-                pad = max(pad, testdist.std() * 3)
-
-            x = np.linspace(LL - pad, UL + pad, 300)
-            if procdist is not None:
-                yproc = procdist.pdf(x)
                 ax = fig.add_subplot(nrows, 1, plotnum+1)
                 ax.plot(x, yproc, label='Process Distribution', color='C0')
                 ax.axvline(LL, ls='--', label='Specification Limits', color='C2')
                 ax.axvline(UL, ls='--', color='C2')
-                ax.fill_between(x, yproc, where=((x <= LL) | (x >= UL)), alpha=.5, color='C0')
+                ax.fill_between(x, yproc, where=outside, alpha=.5, color='C0')
                 ax.set_ylabel('Probability Density')
                 ax.set_xlabel('Value')
                 ax.legend(loc='upper left')
@@ -1385,7 +1685,6 @@ class RiskOutput(output.Output):
                 plotnum += 1
 
             if testdist is not None:
-                ytest = testdist.pdf(x)
                 median = self.risk.get_testmedian()
                 measured = median + self.risk.get_testbias()
                 ax = fig.add_subplot(nrows, 1, plotnum+1)
@@ -1399,9 +1698,9 @@ class RiskOutput(output.Output):
                     ax.axvline(UL-GBU, ls='--', color='C3')
 
                 if measured > UL-GBU or measured < LL+GBL:   # Shade PFR
-                    ax.fill_between(x, ytest, where=((x >= LL) & (x <= UL)), alpha=.5, color='C1')
+                    ax.fill_between(x, ytest, where=~outside, alpha=.5, color='C1')
                 else:  # Shade PFA
-                    ax.fill_between(x, ytest, where=((x <= LL) | (x >= UL)), alpha=.5, color='C1')
+                    ax.fill_between(x, ytest, where=outside, alpha=.5, color='C1')
 
                 ax.set_ylabel('Probability Density')
                 ax.set_xlabel('Value')
@@ -1411,6 +1710,29 @@ class RiskOutput(output.Output):
             fig.tight_layout()
         return fig
 
+    def _pdf_curves(self, procdist, testdist, LL, UL):
+        ''' Get x values and process and test pdfs (None if distribution is None)
+            for plot_dists. Cached by distribution parameters and limits so
+            repeated plots of the same risk don't re-evaluate the pdfs.
+        '''
+        keys = [_dist_key(d) if d is not None else () for d in (procdist, testdist)]
+        key = (*keys, LL, UL) if None not in keys else None
+        if key is not None and key == self._curvekey:
+            return self._curves
+
+        # Add some room on either side of distributions
+        pad = 0
+        if procdist is not None:
+            pad = max(pad, _dist_moments(procdist)[1] * 3)
+        if testdist is not None:
+            pad = max(pad, _dist_moments(testdist)[1] * 3)
+
+        x = np.linspace(LL - pad, UL + pad, 300)
+        yproc = _bind_pdf(procdist)(x) if procdist is not None else None
+        ytest = _bind_pdf(testdist)(x) if testdist is not None else None
+        self._curvekey, self._curves = key, (x, yproc, ytest)
+        return self._curves
+
     def report_montecarlo(self, fig=None, **kwargs):
         ''' Run Monte-Carlo risk and return report. If fig is provided, plot it. '''
         N = kwargs.get('samples', 100000)
@@ -1425,9 +1747,8 @@ class RiskOutput(output.Output):
             fig.clf()
             ax = fig.add_subplot(1, 1, 1)
             if psamples is not None:
-                ifa1 = (tsamples > LL+GB[0]) & (tsamples < UL-GB[1]) & ((psamples < LL) | (psamples > UL))
-                ifr1 = ((tsamples < LL+GB[0]) | (tsamples > UL-GB[1])) & ((psamples > LL) & (psamples < UL))
-                good = np.logical_not(ifa1 | ifr1)
+                ifa1, ifr1 = _classify_samples(psamples, tsamples, LL, UL, *GB)
+                good = ~(ifa1 | ifr1)
                 ax.plot(psamples[good], tsamples[good], marker='o', ls='', markersize=2, color='C0', label='Correct Decision', rasterized=True)
                 ax.plot(psamples[ifa1], tsamples[ifa1], marker='o', ls='', markersize=2, color='C1', label='False Accept', rasterized=True)
                 ax.plot(psamples[ifr1], tsamples[ifr1], marker='o', ls='', markersize=2, color='C2', label='False Reject', rasterized=True)
@@ -1442,10 +1763,12 @@ class RiskOutput(output.Output):
                 ax.set_ylabel('Test Result')
                 pdist = self.risk.get_procdist()
                 tdist = self.risk.get_testdist()
-                xmin = np.nanmin([LLplot, pdist.mean()-5*pdist.std()])
-                xmax = np.nanmax([ULplot, pdist.mean()+5*pdist.std()])
-                ymin = np.nanmin([LLplot, pdist.mean()-5*pdist.std()-tdist.std()])
-                ymax = np.nanmax([ULplot, pdist.mean()+5*pdist.std()+tdist.std()])
+                pmean, pstd = pdist.mean(), _dist_moments(pdist)[1]
+                tstd = _dist_moments(tdist)[1]
+                xmin = np.nanmin([LLplot, pmean-5*pstd])
+                xmax = np.nanmax([ULplot, pmean+5*pstd])
+                ymin = np.nanmin([LLplot, pmean-5*pstd-tstd])
+                ymax = np.nanmax([ULplot, pmean+5*pstd+tstd])
                 ax.set_xlim(xmin, xmax)
                 ax.set_ylim(ymin, ymax)
                 fig.tight_layout()
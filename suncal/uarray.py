@@ -66,11 +66,11 @@ class Array(object):
 
     def has_ux(self):
         ''' Does the array have x-uncertainties? '''
-        return not all(self.ux == 0)
+        return bool(np.any(self.ux))
 
     def has_uy(self):
         ''' Does the array have y-uncertainties? '''
-        return not all(self.uy == 0)
+        return bool(np.any(self.uy))
 
     def sample(self, samples=1000):
         ''' Generate random samples of the array '''
@@ -82,13 +82,15 @@ class Array(object):
 
             # NOTE: Currently only normal distributions can be used here
             distfunc_y = stat.norm(loc=self.y, scale=uy)
-            distfunc_x = stat.norm(loc=self.x, scale=self.ux)
             samples = int(samples)
-            self.xsamples = np.empty((len(self.x), samples))
-            self.ysamples = np.empty((len(self.x), samples))
-            for i in range(samples):
-                self.xsamples[:, i] = distfunc_x.rvs()
-                self.ysamples[:, i] = distfunc_y.rvs()
+            # Shape is (N, samples), transposed from the draw so each sample (column) is contiguous
+            if self.has_ux():
+                distfunc_x = stat.norm(loc=self.x, scale=self.ux)
+                self.xsamples = distfunc_x.rvs(size=(samples, len(self.x))).T
+            else:
+                # Every sample is the nominal x. Read-only view, no random draws or copies.
+                self.xsamples = np.broadcast_to(self.x[:, np.newaxis], (len(self.x), samples))
+            self.ysamples = distfunc_y.rvs(size=(samples, len(self.x))).T
 
     def clear(self):
         ''' Clear sampled data '''
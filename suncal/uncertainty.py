@@ -685,16 +685,17 @@ class Inputs():
         # Make sure ALL values in matrix, including 0's, have correct units
         # why we're looping instead of just subbing into covariance_sym.
         corr = self.correlation()
+        uncs = [v.stdunc() for v in self.inputvars]  # Combine each input's components once, not per matrix element
         Ux = []
-        for i, v1 in enumerate(self.inputvars):
+        for i, u1 in enumerate(uncs):
             row = []
-            for j, v2 in enumerate(self.inputvars):
+            for j, u2 in enumerate(uncs):
                 if i == j:
-                    row.append(v1.stdunc()**2)
+                    row.append(u1**2)
                 elif corr[i, j] != 0:
-                    row.append(v1.stdunc() * v2.stdunc() * corr[i, j])
+                    row.append(u1 * u2 * corr[i, j])
                 else:
-                    row.append(v1.stdunc() * v2.stdunc() * 0)  # *0 produces a 0 with correct units
+                    row.append(u1 * u2 * 0)  # *0 produces a 0 with correct units
             Ux.append(row)
         return Ux
 
@@ -1051,7 +1052,8 @@ class Model():
             ustd = [v.std() for v in ustd.values()]  # dict to list of stds for each function out
 
             # to_reduced_units() will take care of prefix multipliers and dimensionless values
-            CxT.append([(u/self.inputs[i].stdunc()).to_reduced_units() for u in ustd])
+            uinput = self.inputs[i].stdunc()
+            CxT.append([(u/uinput).to_reduced_units() for u in ustd])
             propsT.append([(u/uncert[i]).to_reduced_units().magnitude**2 for i, u in enumerate(ustd)])
 
         MCprops = namedtuple('MCproportions', ['sensitivity', 'proportions'])
@@ -282,7 +282,7 @@ def test_mcmc1():
         return a + b*x**2
 
     arr = curvefit.Array(fig1[:,0], fig1[:,1], uy=0.2)
-    fit = curvefit.CurveFit(arr, sqfunc, p0=(1,1))
+    fit = curvefit.CurveFit(arr, sqfunc, p0=(1,1), seed=100)
     out = fit.calculate(mcmc=True, gum=True, mc=True, lsq=True)
     assert np.isclose(out.mcmc.coeffs[1], 1.21, rtol=.01, atol=.01)
     assert np.isclose(out.mcmc.uncerts[1], 0.18, rtol=.01, atol=.01)
@@ -309,7 +309,7 @@ def test_mcmc2():
         return a + b*x**2
 
     arr = curvefit.Array(fig2[:,0], fig2[:,1])
-    fit = curvefit.CurveFit(arr, sqfunc, p0=(1,1))
+    fit = curvefit.CurveFit(arr, sqfunc, p0=(1,1), seed=33233)
     out = fit.calculate(lsq=False, mcmc=True).mcmc
     unc = out.uncerts[1] * stats.t.ppf(1-(1-.68)/2, df=out.degf)  # Account for t-distribution
     assert np.isclose(out.coeffs[1], 0.94, rtol=.01, atol=.01)
@@ -361,7 +361,7 @@ def test_mcmc3():
 
     # Run the MCMC calculator
     arr = curvefit.Array(x1, y1)
-    fit = curvefit.CurveFit(arr, gaussiandouble, p0=args, bounds=bounds)
+    fit = curvefit.CurveFit(arr, gaussiandouble, p0=args, bounds=bounds, seed=1234)
     out = fit.calculate(mcmc=True, lsq=False, samples=10000, burnin=.2).mcmc
     samples = out.samples
 
@@ -374,6 +374,33 @@ def test_mcmc3():
     assert np.allclose(pslpct, xrdpct, rtol=.01, atol=.01)
 
 
+def test_mcmc_globalseed():
+    ''' MCMC without a CurveFit seed is repeatable using np.random.seed '''
+    def sqfunc(x, a, b):
+        return a + b*x**2
+
+    arr = curvefit.Array(x, y, uy=2)
+    np.random.seed(1)
+    out1 = curvefit.CurveFit(arr, sqfunc, p0=(1,1)).calc_MCMC(samples=2000)
+    np.random.seed(1)
+    out2 = curvefit.CurveFit(arr, sqfunc, p0=(1,1)).calc_MCMC(samples=2000)
+    assert np.array_equal(out1.coeff, out2.coeff)
+
+
+def test_mcmc_design():
+    ''' MCMC chain with incremental residual updates matches chain re-evaluating the function '''
+    def linfunc(x, b, a):
+        return a + b*x
+
+    p = np.array([1., 10.])
+    priors = [lambda x: 1, lambda x: 1]
+    trace1, _, _ = curvefit._mcmc_chain(linfunc, x, y, p, [.1, 1], 100, priors, 5000,
+                                        rng=np.random.default_rng(1))
+    trace2, _, _ = curvefit._mcmc_chain(linfunc, x, y, p, [.1, 1], 100, priors, 5000,
+                                        design=np.vander(x, 2), rng=np.random.default_rng(1), refresh=1000)
+    assert np.allclose(trace1, trace2)
+
+
 def test_uconf():
     ''' Test confidence/prediction band calculations by comparing the linear upred, uconf formulas with
         the nonlinear expression (ref: Christopher Cox and Guangqin Ma. Asymptotic Confidence Bands for Generalized
@@ -619,3 +646,120 @@ def test_absolutesigma2():
     assert np.isclose(fit.out.lsq.y(2747) + fit.out.lsq.u_pred(2747, conf=.95), pred2747nom[0])
     assert np.isclose(fit.out.lsq.y(2747) - fit.out.lsq.u_pred(2747, conf=.95), pred2747nom[1])
     assert np.isclose(fit.out.lsq.residuals.F, Fnom, atol=.5)
+
+
+def test_polyfitbatch():
+    ''' Batched polynomial fit of Monte Carlo samples should match fitting each sample individually '''
+    np.random.seed(8383)
+    xx = np.linspace(0, 10, num=12)
+    ysamples = 3 + 2*xx[:, None] - .1*xx[:, None]**2 + np.random.normal(loc=0, scale=.5, size=(len(xx), 20))
+
+    coeffs = curvefit.polyfit_batch(xx, ysamples, order=1, increasing=False)
+    for i in range(ysamples.shape[1]):
+        assert np.allclose(coeffs[i], curvefit.linefit(xx, ysamples[:, i], sig=0).coeff)
+
+    coeffs = curvefit.polyfit_batch(xx, ysamples, order=2)
+    for i in range(ysamples.shape[1]):
+        assert np.allclose(coeffs[i], np.polyfit(xx, ysamples[:, i], deg=2)[::-1])
+
+
+def test_polyfunc():
+    ''' High-order polynomial function and its design matrix at the fit x values '''
+    arr = uarray.Array(x, y)
+    fit = curvefit.CurveFit(arr, 'poly', polyorder=4)
+    p = (1, .5, -.2, .01, -.001)
+    assert np.allclose(fit.func(arr.x, *p), np.polyval(p[::-1], arr.x))
+    xx = np.linspace(0, 60)
+    assert np.allclose(fit.func(xx, *p), np.polyval(p[::-1], xx))
+    assert np.allclose(fit.design_matrix(arr.x) @ p, np.polyval(p[::-1], arr.x))
+
+    # Fit through the design matrix matches fit through the function
+    pfunc, _ = curvefit.genfit(fit.func, arr.x, arr.y, None, None, p0=fit.p0)
+    pdesign, _ = curvefit.genfit(fit.func, arr.x, arr.y, None, None, p0=fit.p0, design=fit.design_matrix(arr.x))
+    assert np.allclose(pfunc, pdesign)
+
+
+def test_polyfitbatch_xsamples():
+    ''' Batched polynomial fit where each sample has its own x values '''
+    np.random.seed(8384)
+    xx = np.linspace(0, 10, num=12)
+    xsamples = xx[:, None] + np.random.normal(loc=0, scale=.1, size=(len(xx), 20))
+    ysamples = 3 + 2*xsamples - .1*xsamples**2 + np.random.normal(loc=0, scale=.5, size=(len(xx), 20))
+
+    coeffs = curvefit.polyfit_batch(xsamples, ysamples, order=1, increasing=False)
+    for i in range(ysamples.shape[1]):
+        assert np.allclose(coeffs[i], curvefit.linefit(xsamples[:, i], ysamples[:, i], sig=0).coeff)
+
+    coeffs = curvefit.polyfit_batch(xsamples, ysamples, order=2)
+    for i in range(ysamples.shape[1]):
+        assert np.allclose(coeffs[i], np.polyfit(xsamples[:, i], ysamples[:, i], deg=2)[::-1])
+
+    # Large x values, such as dates, are centered and scaled before fitting
+    xsamples = xsamples + 7E5
+    ysamples = 3 + 2*(xsamples-7E5) - .1*(xsamples-7E5)**2 + np.random.normal(loc=0, scale=.5, size=(len(xx), 20))
+    coeffs = curvefit.polyfit_batch(xsamples, ysamples, order=2)
+    for i in range(ysamples.shape[1]):
+        yfit = np.polyval(coeffs[i][::-1], xsamples[:, i])
+        assert np.allclose(yfit, np.polyval(np.polyfit(xsamples[:, i], ysamples[:, i], deg=2), xsamples[:, i]), atol=1E-3)
+
+
+def test_arraysample():
+    ''' Array samples have shape (N, samples) with contiguous columns '''
+    np.random.seed(1010)
+    arr = uarray.Array(x, y, ux=.1, uy=2)
+    arr.sample(500)
+    assert arr.xsamples.shape == (len(x), 500)
+    assert arr.ysamples.shape == (len(x), 500)
+    assert arr.xsamples[:, 0].flags['C_CONTIGUOUS']
+    assert np.allclose(arr.xsamples.std(axis=1), .1, rtol=.15)
+    assert np.allclose(arr.ysamples.mean(axis=1), y, atol=.5)
+
+
+def test_saveconfig():
+    ''' Save and reload curve fit config through yaml '''
+    import io
+    arr = uarray.Array(x, y, ux=.1, uy=2)
+    fit = curvefit.CurveFit(arr, 'poly', polyorder=np.int64(4), absolute_sigma=np.bool_(False))
+    buf = io.StringIO()
+    fit.save_config(buf)
+    buf.seek(0)
+    fit2 = curvefit.CurveFit.from_configfile(buf)
+    assert fit2.fitname == 'poly' and fit2.polyorder == 4
+    assert fit2.absolute_sigma is False
+    assert np.allclose(fit2.p0, fit.p0)
+    assert np.allclose(fit2.arr.x, x)
+    assert np.allclose(fit2.arr.ux, .1)
+    assert np.allclose(fit2.arr.uy, 2)
+
+
+def test_fitnominal():
+    ''' Nominal fit is reused until the data changes '''
+    arr = uarray.Array(x, y)
+    fit = curvefit.CurveFit(arr)
+    p = fit.fit_nominal()
+    assert fit.fit_nominal() is p
+    assert np.allclose(p, curvefit.linefit(x, y, sig=0).coeff)
+    arr.y = y * 2
+    assert np.allclose(fit.fit_nominal(), curvefit.linefit(x, y*2, sig=0).coeff)
+
+
+def test_linefitbatch():
+    ''' Batched line fit matches linefit on each set '''
+    np.random.seed(8385)
+    xx = np.linspace(0, 10, num=12)
+    ysamples = 3 + 2*xx[:, None] + np.random.normal(loc=0, scale=.5, size=(len(xx), 20))
+    sig = np.linspace(.3, .6, num=12)
+    for s in [None, .5, sig]:
+        for absolute_sigma in [True, False]:
+            coeffs, covs = curvefit.linefit_batch(xx, ysamples, s, absolute_sigma=absolute_sigma)
+            for i in range(ysamples.shape[1]):
+                fit = curvefit.linefit(xx, ysamples[:, i], s, absolute_sigma=absolute_sigma)
+                assert np.allclose(coeffs[i], fit.coeff)
+                assert np.allclose(covs[i], fit.covariance)
+
+    xsamples = xx[:, None] + np.random.normal(loc=0, scale=.1, size=ysamples.shape)
+    coeffs, covs = curvefit.linefit_batch(xsamples, ysamples, sig)
+    for i in range(ysamples.shape[1]):
+        fit = curvefit.linefit(xsamples[:, i], ysamples[:, i], sig)
+        assert np.allclose(coeffs[i], fit.coeff)
+        assert np.allclose(covs[i], fit.covariance)
@@ -2,6 +2,7 @@ import numpy as np
 import scipy.stats as stats
 
 from suncal import risk
+from suncal import distributions
 
 
 def test_risknorm():
@@ -39,6 +40,39 @@ def test_approx():
     testit(stats.norm(loc=0, scale=1), stats.norm(loc=0, scale=0.25))
     testit(stats.uniform(0, 2), stats.norm(3, 0.25))
 
+def test_approxcache():
+    # Cached pdf grids must follow changes to a distribution made in place
+    proc = distributions.get_distribution('normal', loc=0, std=.5)
+    test = distributions.get_distribution('normal', loc=0, std=.125)
+    pfa1 = risk.PFA(proc, test, -1, 1, approx=True)
+    proc.update_kwds(loc=.2)
+    pfa2 = risk.PFA(proc, test, -1, 1, approx=True)
+    assert pfa2 > pfa1
+    assert np.isclose(pfa2, risk.PFA(stats.norm(.2, .5), stats.norm(0, .125), -1, 1, approx=True))
+
+def test_approxcachehist():
+    # Frozen histograms keep their parameters on the rv instance, so must not share cached grids
+    np.random.seed(38221)
+    hist1 = stats.rv_histogram(np.histogram(np.random.normal(loc=0, scale=.5, size=10000), bins=40))()
+    hist2 = stats.rv_histogram(np.histogram(np.random.normal(loc=.5, scale=.6, size=10000), bins=40))()
+    test = stats.norm(0, .125)
+    pfa1 = risk.PFA(hist1, test, -1, 1, approx=True)
+    pfa2 = risk.PFA(hist2, test, -1, 1, approx=True)
+    assert np.isclose(pfa1, risk.PFA(hist1, test, -1, 1), atol=.002)
+    assert np.isclose(pfa2, risk.PFA(hist2, test, -1, 1), atol=.002)
+    assert pfa2 > 2 * pfa1
+
+def test_momentscachehist():
+    # Median/std cache must distinguish frozen histograms too
+    np.random.seed(38221)
+    hist1 = stats.rv_histogram(np.histogram(np.random.normal(loc=0, scale=.1, size=10000), bins=40))()
+    hist2 = stats.rv_histogram(np.histogram(np.random.normal(loc=.5, scale=.2, size=10000), bins=40))()
+    rsk = risk.Risk()
+    for hist in [hist1, hist2]:
+        rsk.set_testdist(hist)
+        assert np.isclose(rsk.get_tur(), 1 / (2 * hist.std()))
+        assert np.isclose(rsk.get_testmedian(), hist.median())
+
 def test_riskdiscrete():
     # Verify discrete (normal) approximation is close to integrating
     np.random.seed(772233)
@@ -96,6 +130,23 @@ def test_findguardband():
     assert not np.isfinite(gb2)
 
 
+def test_guardbandbatch():
+    # Batch of guardbands matches individual guardband calculations
+    dproc = stats.norm(loc=0, scale=.5)
+    dtest = stats.norm(loc=0, scale=.125)
+    targets = [.008, .002, .02]
+    gbs = risk.guardband_batch(dproc, dtest, -1, 1, targets)
+    assert np.allclose(gbs, [risk.guardband(dproc, dtest, -1, 1, t) for t in targets], atol=1E-9)
+    assert gbs[1] > gbs[0] > gbs[2]
+
+
+def test_memoize():
+    # Cached guardband PFA evaluations don't collide for very small inputs
+    pfa = risk._memoize(lambda x: x*2)
+    assert pfa(1E-13) == 2E-13
+    assert pfa(2E-13) == 4E-13
+
+
 def test_guardbandnorm():
     TUR = 2.5
     itp = .8
@@ -165,3 +216,26 @@ def test_gb():
     assert np.isclose(risk.PFA(stats.norm(loc=0, scale=1), stats.norm(loc=0, scale=.5), LL=-2, UL=2, GBL=(2-2*.91), GBU=(2-2*.91)), 0.008, atol=.0005)
     assert np.isclose(risk.PFR(stats.norm(loc=0, scale=1), stats.norm(loc=0, scale=.5), LL=-2, UL=2, GBL=(2-2*.91), GBU=(2-2*.91)), 0.066, atol=.001)
 
+
+def test_reportnoplot():
+    # Text-only report matches the table part of the full report
+    rsk = risk.Risk()
+    out = rsk.calculate()
+    rpt = out.report_all(noplot=True)
+    assert len(rpt._plots) == 0
+    assert rpt.get_md() == out.report().get_md()
+
+def test_onesided():
+    # One-sided specification limits. Upper- and lower-only limits are mirror images for symmetric distributions.
+    dproc = stats.norm(loc=0, scale=.5)
+    dtest = stats.norm(loc=0, scale=.25)
+    pfa = risk.PFA(dproc, dtest, -1, np.inf)
+    assert np.isclose(pfa, 0.006194, atol=1E-6)
+    assert np.isclose(pfa, risk.PFA(dproc, dtest, -np.inf, 1))
+    assert np.isclose(pfa, risk.PFA(dproc, dtest, -1, np.inf, approx=True), atol=.0005)
+    pfr = risk.PFR(dproc, dtest, -1, np.inf)
+    assert np.isclose(pfr, 0.020263, atol=1E-6)
+    assert np.isclose(pfr, risk.PFR(dproc, dtest, -np.inf, 1))
+    gb = risk.guardband(dproc, dtest, -1, np.inf, .004)
+    assert np.isclose(gb, 0.091218, atol=1E-5)
+    assert np.isclose(risk.PFA(dproc, dtest, -1, np.inf, GBL=gb), .004)